@@ -0,0 +1,74 @@
+"""
+Time a drive pulse on the first transmon of chains of increasing size, with dense and with
+sparse operators, to find the Hilbert space dimension from which sparse operators are faster
+and to pick `SPARSE_DIM_THRESHOLD`.
+
+    python benchmarks/sparse_crossover.py
+"""
+import time
+
+import numpy as np
+from qiskit import pulse
+
+from quaqsim.architectures import TransmonChainSettings, TransmonSettings
+from quaqsim.architectures.from_qua_channels import ChannelType, TransmonPairBackendChannelIQ, \
+    TransmonPairBackendChannelReadout
+from quaqsim.architectures.transmon_lattice import TransmonChain
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+
+# unevenly spaced, so that no two product states of the chain are degenerate
+FREQUENCIES = [4.86e9, 4.97e9, 5.11e9, 5.29e9, 5.52e9, 5.81e9]
+SIZES = [(2, 3), (3, 3), (2, 6), (2, 8), (4, 3), (3, 5), (2, 12), (5, 3), (4, 4), (6, 3)]
+
+
+def chain(num_qubits: int, dim: int) -> TransmonChain:
+    return TransmonChain(TransmonChainSettings(
+        transmon_settings=[
+            TransmonSettings(resonant_frequency=FREQUENCIES[i], anharmonicity=-0.32e9, rabi_frequency=0.22e9, dim=dim)
+            for i in range(num_qubits)
+        ],
+        coupling_strengths=[0.002e9] * (num_qubits - 1)
+    ))
+
+
+def chain_backend(transmon_chain: TransmonChain, array_library: str) -> TransmonPairBackendFromQUA:
+    config_to_backend_map = {
+        "qubit_1": TransmonPairBackendChannelIQ(
+            qubit_index=0,
+            carrier_frequency=transmon_chain.transmons[0].resonant_frequency,
+            operator_i=transmon_chain.drive_operator(0, 'I'),
+            operator_q=transmon_chain.drive_operator(0, 'Q'),
+            type=ChannelType.DRIVE
+        ),
+        "resonator_1": TransmonPairBackendChannelReadout(0),
+    }
+
+    return TransmonPairBackendFromQUA(transmon_chain, config_to_backend_map, array_library=array_library)
+
+
+def time_solve(backend: TransmonPairBackendFromQUA, repeats: int = 3) -> float:
+    with pulse.build() as schedule:
+        pulse.play(pulse.Gaussian(duration=128, amp=0.1, sigma=32), pulse.DriveChannel(0))
+    solver = backend.options.solver
+    solver_options = backend.options.solver_options
+    y0 = np.eye(solver.model.dim, dtype=complex)[0]
+    t_span = [0, schedule.duration * backend.dt]
+
+    # the first solve compiles the solver kernels
+    solver.solve(t_span=t_span, y0=y0, signals=schedule, **solver_options)
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        solver.solve(t_span=t_span, y0=y0, signals=schedule, **solver_options)
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
+
+
+if __name__ == '__main__':
+    print(f"{'qubits':>6} {'levels':>6} {'dim':>5} {'dense (s)':>10} {'sparse (s)':>10}")
+    for num_qubits, dim in SIZES:
+        transmon_chain = chain(num_qubits, dim)
+        dense = time_solve(chain_backend(transmon_chain, 'jax'))
+        sparse = time_solve(chain_backend(transmon_chain, 'jax_sparse'))
+        print(f"{num_qubits:>6} {dim:>6} {dim ** num_qubits:>5} {dense:>10.3f} {sparse:>10.3f}", flush=True)
@@ -11,7 +11,7 @@ from qiskit.pulse import Schedule
 from qiskit.visualization.pulse_v2 import draw, IQXDebugging
 from qm.qua import *
 
-from ..architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+from ..architectures.backend_cache import backend_cache
 from ..program_to_quantum_pulse_sim_compiler.quantum_pulse_sim_compiler import Compiler
 from ._simulation_request import SimulationRequest, SimulationResult
 from .frontend import dashboard, editor
@@ -168,7 +168,7 @@ def create_app():
             simulation = compiler.compile(
                 request.qua_program,
                 request.channel_map,
-                TransmonPairBackendFromQUA(request.quantum_system, request.channel_map),
+                backend_cache.get(request.quantum_system, request.channel_map),
             )
             results = simulation.run(num_shots)
         except Exception as e:
@@ -1 +1,2 @@
-from .transmon_settings import TransmonSettings
\ No newline at end of file
+from .transmon_settings import TransmonSettings
+from .transmon_lattice_settings import TransmonChainSettings, TransmonCoupling, TransmonLatticeSettings
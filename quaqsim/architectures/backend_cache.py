@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy import sparse
+
+from .from_qua_channels import TransmonPairBackendChannelIQ
+from .transmon_pair import TransmonPair
+from .transmon_pair_backend_from_qua import TransmonPairBackendFromQUA, ConfigToTransmonPairBackendMap
+
+
+def backend_cache_key(transmon_pair: TransmonPair,
+                      config_to_backend_map: ConfigToTransmonPairBackendMap,
+                      **options) -> str:
+    """ Content hash of everything a `TransmonPairBackendFromQUA` is built from. """
+    h = hashlib.sha256()
+    h.update(transmon_pair.settings.to_json(sort_keys=True).encode())
+
+    for element, channel in config_to_backend_map.items():
+        h.update(repr((element, type(channel).__name__, channel.qubit_index, channel.type.value)).encode())
+        if isinstance(channel, TransmonPairBackendChannelIQ):
+            h.update(repr(float(channel.carrier_frequency)).encode())
+            for operator in [channel.operator_i, channel.operator_q]:
+                h.update(_operator_bytes(operator))
+
+    h.update(repr(sorted(options.items())).encode())
+
+    return h.hexdigest()
+
+
+class BackendCache:
+    """
+    LRU cache of `TransmonPairBackendFromQUA`s, so that simulating against the same quantum
+    system and channel map reuses the backend, its solver and its compiled kernels.
+    """
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._backends: OrderedDict[str, TransmonPairBackendFromQUA] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self,
+            transmon_pair: TransmonPair,
+            config_to_backend_map: ConfigToTransmonPairBackendMap,
+            **options) -> TransmonPairBackendFromQUA:
+        key = backend_cache_key(transmon_pair, config_to_backend_map, **options)
+
+        with self._lock:
+            if key in self._backends:
+                self.hits += 1
+                self._backends.move_to_end(key)
+                backend = self._backends[key]
+                # the compiler reads the channel indices from the given map, which may be
+                # a different (but equal) map to the one the backend was built from
+                backend.assign_channel_indices(config_to_backend_map)
+                return backend
+
+            self.misses += 1
+
+        backend = TransmonPairBackendFromQUA(transmon_pair, config_to_backend_map, **options)
+
+        with self._lock:
+            self._backends[key] = backend
+            self._backends.move_to_end(key)
+            while len(self._backends) > self.max_size:
+                self._backends.popitem(last=False)
+
+        return backend
+
+    def clear(self):
+        with self._lock:
+            self._backends.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._backends)
+
+
+backend_cache = BackendCache()
+
+
+def _operator_bytes(operator) -> bytes:
+    if sparse.issparse(operator):
+        operator = sparse.csr_matrix(operator, dtype=complex)
+        operator.sum_duplicates()
+        operator.eliminate_zeros()
+        return b"".join([
+            repr(operator.shape).encode(), operator.data.tobytes(), operator.indices.tobytes(), operator.indptr.tobytes()
+        ])
+
+    operator = np.ascontiguousarray(operator, dtype=complex)
+    return repr(operator.shape).encode() + operator.tobytes()
@@ -0,0 +1,340 @@
+import warnings
+from collections import defaultdict
+from typing import List, Optional
+
+import jax
+import numpy as np
+from jax.experimental import sparse as jsparse
+from qiskit.pulse import Schedule
+from qiskit_dynamics import Solver, DYNAMICS_NUMPY as unp
+from qiskit_dynamics.models import HamiltonianModel
+from qiskit_dynamics.signals import DiscreteSignal
+from qiskit_dynamics.solvers.solver_classes import organize_signals_to_channels, \
+    validate_and_format_initial_state, format_final_states
+from qiskit_dynamics.solvers.solver_functions import solve_lmde
+from scipy.integrate._ivp.ivp import OdeResult
+
+from .compilation_cache import activate_compilation_cache, deactivate_compilation_cache, \
+    is_compilation_cache_active
+from .segment_propagation import PeriodPropagatorCache, find_segments, segment_carrier_frequency
+
+_PERIOD_TOLERANCE = 1e-12
+
+
+class BatchedSolver(Solver):
+    """
+    Solver which, when called with `batched=True`, integrates all schedules sharing
+    an integration interval and initial state in a single `jax.vmap`-ed call.
+
+    Schedules compiled from a sweep (e.g. `for_` over `amp(a)`) only differ by their
+    samples, so they are stacked into one array and solved together instead of
+    being integrated one after another. In both modes the jitted kernels are kept on
+    the solver, so that repeated runs only pay the compilation once.
+
+    With `analytic_segments=True`, every schedule is instead split into segments over which
+    its samples are constant. A constant drive with a single carrier is periodic in the lab
+    frame, so such a segment is propagated by a power of the (cached) propagator over one
+    carrier period, and only the remaining pieces are integrated. Idle segments, where no
+    channel is driven, evolve under the static Hamiltonian alone and are not integrated at all.
+    Segmented schedules are solved one after another, so `analytic_segments` takes precedence
+    over `batched=True`, with a warning.
+
+    With `analytic_idle=True` (the default), schedules solved one after another are split at
+    their idle segments only, which are propagated in the same way. Both only apply to
+    Hamiltonian models without the rotating wave approximation.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._static_hamiltonian = kwargs.get("static_hamiltonian")
+        self._static_eigensystem = None
+        self._batched = False
+        self._jit_cache = {}
+        self.compilation_cache_dir: Optional[str] = None
+        self.compilation_cache_key: Optional[str] = None
+        self.analytic_segments = False
+        self.analytic_idle = True
+        self.period_propagators = PeriodPropagatorCache()
+
+    def __deepcopy__(self, memo):
+        # `DynamicsBackend.run` deep-copies itself whenever run options are given; the
+        # solver holds no state between solves, so share it to keep its compiled kernels.
+        return self
+
+    def solve(self, t_span, y0, signals=None, convert_results: bool = True, batched: bool = False, **kwargs):
+        if self.compilation_cache_dir is not None:
+            activate_compilation_cache(self.compilation_cache_dir, self.compilation_cache_key)
+        elif is_compilation_cache_active():
+            # the cache directory is global to jax, and must not collect the kernels of solvers
+            # which did not opt in
+            deactivate_compilation_cache()
+
+        self._batched = batched
+        try:
+            return super().solve(t_span, y0, signals, convert_results, **kwargs)
+        finally:
+            self._batched = False
+
+    def _solve_schedule_list_jax(self,
+                                 t_span_list: List,
+                                 y0_list: List,
+                                 schedule_list: List[Schedule],
+                                 convert_results: bool = True,
+                                 **kwargs) -> List[OdeResult]:
+        # the static propagator is exact for the lab frame Hamiltonian, which the rotating wave
+        # approximation changes
+        analytic = isinstance(self.model, HamiltonianModel) and not self._rwa_signal_map
+        if analytic and self.analytic_segments:
+            if self._batched:
+                warnings.warn("Schedules are not batched with analytic_segments=True, and are solved sequentially.")
+            return self._solve_schedule_list_segmented(
+                t_span_list, y0_list, schedule_list, convert_results, **kwargs
+            )
+
+        if analytic and self.analytic_idle and not self._batched and "t_eval" not in kwargs:
+            return self._solve_schedule_list_segmented(
+                t_span_list, y0_list, schedule_list, convert_results, constant_segments=False, **kwargs
+            )
+
+        if not self._batched:
+            return self._solve_schedule_list_jax_sequential(
+                t_span_list, y0_list, schedule_list, convert_results, **kwargs
+            )
+
+        formatted_y0s = [validate_and_format_initial_state(y0, self.model) for y0 in y0_list]
+
+        # schedules are only batched together if they can share the same integration interval and initial state
+        batches = defaultdict(list)
+        for i, (t_span, (y0, y0_input, y0_cls, _)) in enumerate(zip(t_span_list, formatted_y0s)):
+            key = (tuple(np.asarray(t_span, dtype=float)), y0_cls, np.shape(y0), np.shape(y0_input))
+            batches[key].append(i)
+
+        jit_batched_sim_function = self._get_jit_sim_function(batched=True, **kwargs)
+
+        all_results = [None] * len(schedule_list)
+        for (t_span, y0_cls, _, _), indices in batches.items():
+            all_samples = self._stack_samples([schedule_list[i] for i in indices])
+            y0s = np.stack([formatted_y0s[i][0] for i in indices])
+            y0_inputs = np.stack([formatted_y0s[i][1] for i in indices])
+
+            results_t, results_y = jit_batched_sim_function(
+                unp.asarray(t_span),
+                unp.asarray(y0s),
+                unp.asarray(all_samples),
+                unp.asarray(y0_inputs),
+                y0_cls,
+            )
+
+            for batch_index, i in enumerate(indices):
+                results = OdeResult(t=results_t[batch_index], y=results_y[batch_index])
+                state_type_wrapper = formatted_y0s[i][3]
+                if y0_cls is not None and convert_results:
+                    results.y = [state_type_wrapper(yi) for yi in results.y]
+                all_results[i] = results
+
+        return all_results
+
+    def _solve_schedule_list_jax_sequential(self,
+                                            t_span_list: List,
+                                            y0_list: List,
+                                            schedule_list: List[Schedule],
+                                            convert_results: bool = True,
+                                            **kwargs) -> List[OdeResult]:
+        jit_sim_function = self._get_jit_sim_function(batched=False, **kwargs)
+
+        # as in `Solver`, pad all schedules to the same duration to avoid recompilation
+        all_samples = self._stack_samples(schedule_list)
+
+        all_results = []
+        for t_span, y0, samples in zip(t_span_list, y0_list, all_samples):
+            y0, y0_input, y0_cls, state_type_wrapper = validate_and_format_initial_state(y0, self.model)
+
+            results_t, results_y = jit_sim_function(
+                unp.asarray(t_span),
+                unp.asarray(y0),
+                unp.asarray(samples),
+                unp.asarray(y0_input),
+                y0_cls,
+            )
+            results = OdeResult(t=results_t, y=results_y)
+            if y0_cls is not None and convert_results:
+                results.y = [state_type_wrapper(yi) for yi in results.y]
+            all_results.append(results)
+
+        return all_results
+
+    def _solve_schedule_list_segmented(self,
+                                       t_span_list: List,
+                                       y0_list: List,
+                                       schedule_list: List[Schedule],
+                                       convert_results: bool = True,
+                                       constant_segments: bool = True,
+                                       **kwargs) -> List[OdeResult]:
+        """
+        Solve each schedule, propagating its idle segments, and with `constant_segments` its
+        constant driven segments, without integrating them.
+        """
+        jit_sim_function = self._get_jit_sim_function(batched=False, **kwargs)
+        # the period propagator is raised to a large power, so it is integrated to a tighter
+        # tolerance than the rest of the schedule, which is affordable as it is only one period
+        period_kwargs = {**kwargs, "atol": _PERIOD_TOLERANCE, "rtol": _PERIOD_TOLERANCE}
+        jit_period_sim_function = self._get_jit_sim_function(batched=False, **period_kwargs)
+        solver_key = tuple(sorted(kwargs.items()))
+        carrier_freqs = [self._channel_carrier_freqs[channel] for channel in self._all_channels]
+
+        all_samples = self._stack_samples(schedule_list)
+
+        all_results = []
+        for t_span, y0, samples in zip(t_span_list, y0_list, all_samples):
+            y0, y0_input, y0_cls, state_type_wrapper = validate_and_format_initial_state(y0, self.model)
+
+            def integrate(t0, t1, y, sim_function=jit_sim_function):
+                _, y = sim_function(
+                    unp.asarray([t0, t1]), unp.asarray(y), unp.asarray(samples), unp.asarray(y), None
+                )
+                return np.asarray(y[-1])
+
+            t_start, t_stop = np.asarray(t_span, dtype=float)
+            start, stop = round(t_start / self._dt), round(t_stop / self._dt)
+            if np.isclose(start * self._dt, t_start) and np.isclose(stop * self._dt, t_stop):
+                segments = find_segments(samples, start, stop)
+            else:
+                segments = []
+
+            y = np.asarray(y0)
+            # integration is deferred so that consecutive non-analytic pieces take a single call
+            integrate_from = t_start
+            for segment in segments:
+                if not segment.constant:
+                    continue
+
+                t0, t1 = segment.start * self._dt, segment.stop * self._dt
+                values = samples[:, segment.start]
+                if not np.any(values):
+                    if integrate_from < t0:
+                        y = integrate(integrate_from, t0, y)
+                    y = self._lab_to_frame(t1, self._static_propagator(t1 - t0), t0) @ y
+                    integrate_from = t1
+                    continue
+
+                if not constant_segments:
+                    continue
+
+                carrier_freq = segment_carrier_frequency(values, carrier_freqs)
+                if carrier_freq is None:
+                    continue
+
+                num_periods = int((t1 - t0) * carrier_freq)
+                if num_periods < 2:
+                    continue
+
+                if integrate_from < t0:
+                    y = integrate(integrate_from, t0, y)
+
+                period = 1 / carrier_freq
+                key = PeriodPropagatorCache.key(values, carrier_freq, t0, solver_key)
+                period_propagator = self.period_propagators.get(key)
+                if period_propagator is None:
+                    frame_propagator = integrate(
+                        t0, t0 + period, np.eye(self.model.dim, dtype=complex), jit_period_sim_function
+                    )
+                    period_propagator = self._frame_to_lab(t0 + period, frame_propagator, t0)
+                    self.period_propagators.put(key, period_propagator)
+
+                propagator = np.linalg.matrix_power(period_propagator, num_periods)
+                y = self._lab_to_frame(t0 + num_periods * period, propagator, t0) @ y
+                integrate_from = t0 + num_periods * period
+
+            if integrate_from < t_stop:
+                y = integrate(integrate_from, t_stop, y)
+
+            results = OdeResult(
+                t=np.asarray(t_span),
+                y=format_final_states(np.stack([np.asarray(y0), y]), self.model, y0_input, y0_cls),
+            )
+            if y0_cls is not None and convert_results:
+                results.y = [state_type_wrapper(yi) for yi in results.y]
+            all_results.append(results)
+
+        return all_results
+
+    def _static_propagator(self, duration: float) -> np.ndarray:
+        """ Lab frame propagator of the static Hamiltonian over `duration`. """
+        if self._static_hamiltonian is None:
+            return np.eye(self.model.dim, dtype=complex)
+
+        if self._static_eigensystem is None:
+            static_hamiltonian = self._static_hamiltonian
+            if isinstance(static_hamiltonian, jsparse.BCOO):
+                static_hamiltonian = static_hamiltonian.todense()
+            self._static_eigensystem = np.linalg.eigh(np.asarray(static_hamiltonian))
+        energies, states = self._static_eigensystem
+
+        return (states * np.exp(-1j * energies * duration)) @ states.conj().T
+
+    def _frame_to_lab(self, t1: float, propagator: np.ndarray, t0: float) -> np.ndarray:
+        """ Lab frame propagator from `t0` to `t1` of a propagator in the rotating frame. """
+        rotating_frame = self.model.rotating_frame
+        propagator = np.asarray(rotating_frame.state_out_of_frame(t1, propagator))
+        return np.asarray(rotating_frame.state_out_of_frame(t0, propagator.conj().T)).conj().T
+
+    def _lab_to_frame(self, t1: float, propagator: np.ndarray, t0: float) -> np.ndarray:
+        """ Rotating frame propagator from `t0` to `t1` of a propagator in the lab frame. """
+        rotating_frame = self.model.rotating_frame
+        propagator = np.asarray(rotating_frame.state_into_frame(t1, propagator))
+        return np.asarray(rotating_frame.state_into_frame(t0, propagator.conj().T)).conj().T
+
+    def _stack_samples(self, schedules: List[Schedule]) -> np.ndarray:
+        max_duration = max(schedule.duration for schedule in schedules)
+        all_samples = np.zeros((len(schedules), len(self._all_channels), max_duration), dtype=complex)
+        for batch_index, schedule in enumerate(schedules):
+            for channel_index, signal in enumerate(self._schedule_converter.get_signals(schedule)):
+                all_samples[batch_index, channel_index, 0:len(signal.samples)] = np.array(signal.samples)
+
+        return all_samples
+
+    def _get_jit_sim_function(self, batched: bool, **kwargs):
+        key = (batched, tuple(sorted(kwargs.items())))
+        if key not in self._jit_cache:
+            sim_function = self._sim_function(**kwargs)
+            if batched:
+                sim_function = _vmap_sim_function(sim_function)
+            self._jit_cache[key] = jax.jit(sim_function, static_argnums=(4,))
+
+        return self._jit_cache[key]
+
+    def _sim_function(self, **kwargs):
+        def sim_function(t_span, y0, all_samples, y0_input, y0_cls):
+            # store signals to ensure purity
+            model_signals = self.model.signals
+
+            signals = []
+            for idx, samples in enumerate(all_samples):
+                carrier_freq = self._channel_carrier_freqs[self._all_channels[idx]]
+                signals.append(DiscreteSignal(dt=self._dt, samples=samples, carrier_freq=carrier_freq))
+
+            signals = organize_signals_to_channels(
+                signals,
+                self._all_channels,
+                self.model.__class__,
+                self._hamiltonian_channels,
+                self._dissipator_channels,
+            )
+            self._set_new_signals(signals)
+
+            results = solve_lmde(generator=self.model, t_span=t_span, y0=y0, **kwargs)
+            results.y = format_final_states(results.y, self.model, y0_input, y0_cls)
+
+            self.model.signals = model_signals
+
+            return results.t, results.y
+
+        return sim_function
+
+
+def _vmap_sim_function(sim_function):
+    def batched_sim_function(t_span, y0s, all_samples, y0_inputs, y0_cls):
+        return jax.vmap(
+            lambda y0, samples, y0_input: sim_function(t_span, y0, samples, y0_input, y0_cls)
+        )(y0s, all_samples, y0_inputs)
+
+    return batched_sim_function
@@ -0,0 +1,115 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import jax
+from jax.experimental.compilation_cache import compilation_cache
+
+_CACHE_HIT_EVENT = '/jax/compilation_cache/cache_hits'
+_CACHE_MISS_EVENT = '/jax/compilation_cache/cache_misses'
+
+
+@dataclass
+class CompilationCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+_active_cache_dir: Optional[str] = None
+# jax configuration overridden while a cache directory is active, restored on deactivation
+_PERSISTENT_CACHE_OPTIONS = {
+    "jax_persistent_cache_min_compile_time_secs": 0,
+    "jax_persistent_cache_min_entry_size_bytes": 0,
+}
+_saved_options: Dict[str, object] = {}
+_stats: Dict[str, CompilationCacheStats] = {}
+_listener_registered = False
+
+
+def compilation_cache_key(dim: int,
+                          num_channels: int,
+                          method: str,
+                          atol: float,
+                          rtol: float,
+                          hmax: Optional[float],
+                          platform: str = 'cpu',
+                          array_library: str = 'jax',
+                          lindblad: bool = False,
+                          rwa: bool = False) -> str:
+    """ Name of the cache sub-directory holding kernels compiled for this Hamiltonian structure. """
+    structure = (dim, num_channels, method, atol, rtol, hmax, platform, array_library, lindblad, rwa, jax.__version__)
+    digest = hashlib.sha256(repr(structure).encode()).hexdigest()[:16]
+
+    return f"dim{dim}_channels{num_channels}_{method}_{digest}"
+
+
+def activate_compilation_cache(cache_dir: str, key: str):
+    """
+    Point the persistent jax compilation cache at the sub-directory of `cache_dir` for `key`.
+
+    Jax only holds one cache directory per process, so this is called before each solve and
+    is a no-op if the directory is already the active one. The jax configuration it changes
+    is restored by `deactivate_compilation_cache`.
+    """
+    global _active_cache_dir
+    _register_listener()
+
+    path = os.path.join(cache_dir, key)
+    _stats.setdefault(path, CompilationCacheStats())
+    if path == _active_cache_dir:
+        return
+
+    os.makedirs(path, exist_ok=True)
+    # jax reads the cache directory once, on the first compilation in the process
+    compilation_cache.reset_cache()
+    if _active_cache_dir is None:
+        _saved_options.update({name: getattr(jax.config, name) for name in _PERSISTENT_CACHE_OPTIONS})
+        _saved_options["jax_compilation_cache_dir"] = jax.config.jax_compilation_cache_dir
+    for name, value in _PERSISTENT_CACHE_OPTIONS.items():
+        jax.config.update(name, value)
+    compilation_cache.set_cache_dir(path)
+    _active_cache_dir = path
+
+
+def deactivate_compilation_cache():
+    """ Stop caching kernels on disk, and restore the jax configuration from before activation. """
+    global _active_cache_dir
+    if _active_cache_dir is not None:
+        compilation_cache.reset_cache()
+        for name, value in _saved_options.items():
+            jax.config.update(name, value)
+        _saved_options.clear()
+        _active_cache_dir = None
+
+
+def is_compilation_cache_active() -> bool:
+    return _active_cache_dir is not None
+
+
+def get_compilation_cache_stats(cache_dir: Optional[str] = None, key: Optional[str] = None) -> CompilationCacheStats:
+    """ Cache hits and misses for one cache sub-directory, or summed over all of them. """
+    if cache_dir is not None and key is not None:
+        stats = _stats.get(os.path.join(cache_dir, key), CompilationCacheStats())
+        return CompilationCacheStats(hits=stats.hits, misses=stats.misses)
+
+    return CompilationCacheStats(
+        hits=sum(stats.hits for stats in _stats.values()),
+        misses=sum(stats.misses for stats in _stats.values()),
+    )
+
+
+def _on_event(event: str, **kwargs):
+    if _active_cache_dir is None:
+        return
+    if event == _CACHE_HIT_EVENT:
+        _stats[_active_cache_dir].hits += 1
+    elif event == _CACHE_MISS_EVENT:
+        _stats[_active_cache_dir].misses += 1
+
+
+def _register_listener():
+    global _listener_registered
+    if not _listener_registered:
+        jax.monitoring.register_event_listener(_on_event)
+        _listener_registered = True
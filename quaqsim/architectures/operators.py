@@ -1,4 +1,7 @@
+from typing import List
+
 import numpy as np
+from scipy import sparse
 
 dim = 3
 
@@ -17,3 +20,27 @@ a1 = np.kron(a, ident)  # excitation ladder operator, qubit 1
 
 a0dag = np.kron(ident, adag)  # relaxation ladder operator, qubit 0
 a1dag = np.kron(adag, ident)  # relaxation ladder operator, qubit 1
+
+
+def ladder_operator(dim: int) -> np.ndarray:
+    return np.diag(np.sqrt(np.arange(1, dim)), 1)
+
+
+def ladder_operator_dag(dim: int) -> np.ndarray:
+    return np.diag(np.sqrt(np.arange(1, dim)), -1)
+
+
+def number_operator(dim: int) -> np.ndarray:
+    return np.diag(np.arange(dim))
+
+
+def embed(operator, qubit_index: int, subsystem_dims: List[int]) -> sparse.csr_matrix:
+    """
+    Sparse operator acting as `operator` on subsystem `qubit_index` and as the identity on
+    the others. As in the operators above, subsystem 0 is the rightmost Kronecker factor.
+    """
+    dim_before = int(np.prod(subsystem_dims[:qubit_index]))
+    dim_after = int(np.prod(subsystem_dims[qubit_index + 1:]))
+    embedded = sparse.kron(sparse.csr_matrix(operator, dtype=complex), sparse.identity(dim_before, dtype=complex))
+
+    return sparse.kron(sparse.identity(dim_after, dtype=complex), embedded, format='csr')
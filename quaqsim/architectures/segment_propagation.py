@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Segment:
+    """ Samples `[start, stop)` of a schedule, constant over all channels if `constant`. """
+    start: int
+    stop: int
+    constant: bool
+
+
+def find_segments(samples: np.ndarray,
+                  start: int,
+                  stop: int,
+                  min_length: int = 2) -> List[Segment]:
+    """
+    Split the samples (channels x time) between `start` and `stop` into runs over which every
+    channel is constant. Runs shorter than `min_length` are merged into the neighbouring
+    non-constant segments.
+    """
+    if stop <= start:
+        return []
+
+    changes = np.any(samples[:, start + 1:stop] != samples[:, start:stop - 1], axis=0)
+    edges = [start, *(start + 1 + np.flatnonzero(changes)), stop]
+
+    segments = []
+    for run_start, run_stop in zip(edges[:-1], edges[1:]):
+        constant = run_stop - run_start >= min_length
+        if segments and not constant and not segments[-1].constant:
+            segments[-1] = Segment(segments[-1].start, run_stop, False)
+        else:
+            segments.append(Segment(int(run_start), int(run_stop), constant))
+
+    return segments
+
+
+def segment_carrier_frequency(values: np.ndarray,
+                              carrier_freqs: List[float]) -> Optional[float]:
+    """
+    The carrier frequency shared by every channel driven with `values` over a constant segment,
+    or None if no channel is driven or the driven channels have different carriers.
+    """
+    driven_freqs = {carrier_freqs[i] for i in np.flatnonzero(values)}
+    if len(driven_freqs) != 1:
+        return None
+
+    return driven_freqs.pop()
+
+
+class PeriodPropagatorCache:
+    """
+    LRU cache of lab-frame propagators over one carrier period of a constant segment, which
+    only depend on the segment's samples, carrier and start time modulo the period.
+    """
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._propagators: Dict[tuple, np.ndarray] = {}
+
+    @staticmethod
+    def key(values: np.ndarray, carrier_freq: float, t0: float, solver_key: tuple) -> tuple:
+        phase = round((t0 * carrier_freq) % 1., 12) % 1.
+        return values.tobytes(), float(carrier_freq), phase, solver_key
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        propagator = self._propagators.pop(key, None)
+        if propagator is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._propagators[key] = propagator
+        return propagator
+
+    def put(self, key: tuple, propagator: np.ndarray):
+        self._propagators[key] = propagator
+        while len(self._propagators) > self.max_size:
+            self._propagators.pop(next(iter(self._propagators)))
+
+    def clear(self):
+        self._propagators.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._propagators)
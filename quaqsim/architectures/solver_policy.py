@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SolverPolicy:
+    """
+    Solver tolerances derived from the precision the populations are needed to, which is the
+    shot noise `1 / sqrt(num_shots)` of the run unless `precision` is given.
+
+    The tolerances are chosen so that the solver error stays a `safety_factor` below the
+    precision. On Rabi and Ramsey sweeps of the transmon pair, the error of the populations
+    was found to be about `error_per_tolerance` times the (absolute and relative) tolerance.
+    """
+    precision: Optional[float] = None
+    safety_factor: float = 0.1
+    error_per_tolerance: float = 100.
+    min_tolerance: float = 1e-8
+    max_tolerance: float = 1e-4
+    # in units of the sample time `dt`, or None to keep the maximum step of the backend, which
+    # is chosen for its model (e.g. longer with the rotating wave approximation). Samples are
+    # piecewise constant, and letting the solver step over them quickly loses the pulses.
+    max_step: Optional[float] = None
+
+    def target_precision(self, num_shots: Optional[int]) -> Optional[float]:
+        if self.precision is not None:
+            return self.precision
+        if num_shots is None:
+            return None
+
+        return 1 / np.sqrt(num_shots)
+
+    def tolerance(self, num_shots: Optional[int]) -> float:
+        precision = self.target_precision(num_shots)
+        if precision is None:
+            return self.min_tolerance
+
+        tolerance = self.safety_factor * precision / self.error_per_tolerance
+        return float(np.clip(tolerance, self.min_tolerance, self.max_tolerance))
+
+    def solver_options(self, num_shots: Optional[int], dt: float) -> dict:
+        tolerance = self.tolerance(num_shots)
+        options = {"atol": tolerance, "rtol": tolerance}
+        if self.max_step is not None:
+            options["hmax"] = self.max_step * dt
+
+        return options
+
+
+@dataclass
+class AccuracyCheck:
+    """ Largest population difference between a run with a solver policy and a reference run. """
+    max_error: float
+    precision: float
+
+    @property
+    def passed(self) -> bool:
+        return self.max_error <= self.precision
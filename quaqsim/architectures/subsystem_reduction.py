@@ -0,0 +1,81 @@
+from typing import Iterable, List, Union
+
+import numpy as np
+from scipy import sparse
+
+from .transmon_lattice import TransmonLattice
+from .transmon_pair import TransmonPair
+
+# relative to the largest element of the operator
+_TOLERANCE = 1e-12
+
+
+class ReducedSystem:
+    """
+    The subspace of an architecture in which every qubit but `qubits` stays in its ground
+    state. The idle qubits are kept as subsystems of dimension 1, so that qubit indices,
+    memory slots and measurement outcomes are the same as for the full architecture.
+    """
+    def __init__(self, architecture: Union[TransmonPair, TransmonLattice], qubits: Iterable[int]):
+        self.architecture = architecture
+        self.qubits = sorted(set(qubits))
+        full_dims = architecture.subsystem_dims
+        self.subsystem_dims = [dim if i in self.qubits else 1 for i, dim in enumerate(full_dims)]
+        self._isometry = _ground_state_isometry(full_dims, self.subsystem_dims)
+
+    @property
+    def settings(self):
+        return self.architecture.settings
+
+    def system_hamiltonian(self) -> sparse.csr_matrix:
+        return self.reduce(self.architecture.system_hamiltonian())
+
+    def static_dissipators(self) -> List[sparse.csr_matrix]:
+        # the dissipators of idle qubits vanish on their ground state
+        reduced_dissipators = [self.reduce(dissipator) for dissipator in self.architecture.static_dissipators()]
+        return [dissipator for dissipator in reduced_dissipators if dissipator.count_nonzero() > 0]
+
+    def reduce(self, operator) -> sparse.csr_matrix:
+        """ The operator restricted to the reduced subspace. """
+        isometry = self._isometry
+        return (isometry.conj().T @ sparse.csr_matrix(operator, dtype=complex) @ isometry).tocsr()
+
+    def coupling_to_idle_qubits(self) -> float:
+        """ The largest coupling strength between a kept and an idle qubit. """
+        if isinstance(self.architecture, TransmonPair):
+            couplings = [(0, 1, self.architecture.coupling_strength)]
+        else:
+            couplings = [
+                (coupling.qubit_1_index, coupling.qubit_2_index, coupling.coupling_strength)
+                for coupling in self.architecture.couplings
+            ]
+
+        return max((
+            abs(coupling_strength) for qubit_1, qubit_2, coupling_strength in couplings
+            if (qubit_1 in self.qubits) != (qubit_2 in self.qubits)
+        ), default=0.)
+
+    def acts_within(self, operator) -> bool:
+        """ Whether `operator` leaves the reduced subspace invariant, e.g. drives a kept qubit. """
+        operator = sparse.csr_matrix(operator, dtype=complex)
+        leaked = operator @ self._isometry - self._isometry @ self.reduce(operator)
+        if leaked.nnz == 0:
+            return True
+
+        return abs(leaked).max() <= _TOLERANCE * abs(operator).max()
+
+
+def _ground_state_isometry(full_dims: List[int], reduced_dims: List[int]) -> sparse.csr_matrix:
+    """
+    Sparse map from the reduced space into the full one, taking each reduced basis state to
+    the full one with the same levels on the kept qubits and the ground state on the others.
+    """
+    reduced_levels = np.indices(reduced_dims[::-1]).reshape(len(reduced_dims), -1)[::-1]
+    full_strides = np.concatenate([[1], np.cumprod(full_dims[:-1])]).astype(int)
+    full_indices = full_strides @ reduced_levels
+    num_reduced = int(np.prod(reduced_dims))
+
+    return sparse.csr_matrix(
+        (np.ones(num_reduced, dtype=complex), (full_indices, np.arange(num_reduced))),
+        shape=(int(np.prod(full_dims)), num_reduced)
+    )
@@ -1,5 +1,7 @@
+from typing import List
+
 import numpy as np
-from .operators import N, ident, a, adag
+from .operators import ladder_operator, ladder_operator_dag, number_operator
 from .transmon_settings import TransmonSettings
 
 
@@ -9,14 +11,40 @@ class Transmon:
         self.resonant_frequency = settings.resonant_frequency
         self.rabi_frequency = settings.rabi_frequency
         self.anharmonicity = settings.anharmonicity
+        self.dim = settings.dim
+        self.t1 = settings.t1
+        self.t2 = settings.t2
+        for name, time in [("T1", self.t1), ("T2", self.t2)]:
+            if time is not None and time <= 0:
+                raise ValueError(f"{name} must be positive, got {time}")
+        if self.t1 is not None and self.t2 is not None and self.t2 > 2 * self.t1:
+            raise ValueError(f"T2 can be at most 2 * T1, got T1 = {self.t1} and T2 = {self.t2}")
 
     def system_hamiltonian(self) -> np.ndarray:
+        N = number_operator(self.dim)
+        ident = np.eye(self.dim, dtype=complex)
         return 2 * np.pi * self.resonant_frequency * N + np.pi * self.anharmonicity * N * (N - ident)
 
     def drive_operator(self, quadrature="I") -> np.ndarray:
+        a, adag = ladder_operator(self.dim), ladder_operator_dag(self.dim)
         if quadrature == "I":
             return 2 * np.pi * self.rabi_frequency * (a + adag)
         elif quadrature == "Q":
             return 2 * 1j * np.pi * self.rabi_frequency * (a - adag)
         else:
             raise NotImplementedError(f"Expected quadrature to be I or Q, got {quadrature}")
+
+    def dissipators(self) -> List[np.ndarray]:
+        """
+        Lindblad operators of energy relaxation at rate 1 / T1, and of the pure dephasing
+        which, together with the relaxation, decays coherences at rate 1 / T2.
+        """
+        dissipators = []
+        if self.t1 is not None:
+            dissipators.append(np.sqrt(1 / self.t1) * ladder_operator(self.dim))
+        if self.t2 is not None:
+            dephasing_rate = 1 / self.t2 - (0 if self.t1 is None else 1 / (2 * self.t1))
+            if dephasing_rate > 0:
+                dissipators.append(np.sqrt(2 * dephasing_rate) * number_operator(self.dim))
+
+        return dissipators
@@ -0,0 +1,104 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .operators import embed, ladder_operator, ladder_operator_dag, number_operator
+from .transmon import Transmon
+from .transmon_lattice_settings import TransmonChainSettings, TransmonLatticeSettings
+
+
+class TransmonLattice:
+    """
+    Transmons with exchange couplings along the edges of an arbitrary graph. The operators
+    are sparse, built on first use by embedding each transmon's operators into the full
+    space, so that no dense operator of the full dimension is ever formed.
+    """
+    def __init__(self, settings: TransmonLatticeSettings):
+        self.settings = settings
+        self.transmons = [Transmon(transmon_settings) for transmon_settings in settings.transmon_settings]
+        self.subsystem_dims = [transmon.dim for transmon in self.transmons]
+        self.couplings = settings.couplings
+        for coupling in self.couplings:
+            indices = (coupling.qubit_1_index, coupling.qubit_2_index)
+            if indices[0] == indices[1] or not all(0 <= i < self.num_qubits for i in indices):
+                raise ValueError(f"Invalid coupling between qubits {indices} of a {self.num_qubits} qubit lattice")
+
+        self._operators: Dict[Tuple, sparse.csr_matrix] = {}
+
+    @property
+    def num_qubits(self) -> int:
+        return len(self.transmons)
+
+    @property
+    def dim(self) -> int:
+        return int(np.prod(self.subsystem_dims))
+
+    def system_hamiltonian(self) -> sparse.csr_matrix:
+        return self._operator(('system_hamiltonian',), self._system_hamiltonian)
+
+    def drive_operator(self, qubit_index: int, quadrature="I") -> sparse.csr_matrix:
+        return self._operator(
+            ('drive', qubit_index, quadrature),
+            lambda: self.embed(self.transmons[qubit_index].drive_operator(quadrature), qubit_index)
+        )
+
+    def number_operator(self, qubit_index: int) -> sparse.csr_matrix:
+        return self._operator(
+            ('number', qubit_index),
+            lambda: self.embed(number_operator(self.subsystem_dims[qubit_index]), qubit_index)
+        )
+
+    def ladder_operator(self, qubit_index: int) -> sparse.csr_matrix:
+        return self._operator(
+            ('ladder', qubit_index),
+            lambda: self.embed(ladder_operator(self.subsystem_dims[qubit_index]), qubit_index)
+        )
+
+    def ladder_operator_dag(self, qubit_index: int) -> sparse.csr_matrix:
+        return self._operator(
+            ('ladder_dag', qubit_index),
+            lambda: self.embed(ladder_operator_dag(self.subsystem_dims[qubit_index]), qubit_index)
+        )
+
+    def static_dissipators(self) -> List[sparse.csr_matrix]:
+        return [
+            self._operator(('dissipator', qubit_index, i), lambda: self.embed(dissipator, qubit_index))
+            for qubit_index, transmon in enumerate(self.transmons)
+            for i, dissipator in enumerate(transmon.dissipators())
+        ]
+
+    def embed(self, operator, qubit_index: int) -> sparse.csr_matrix:
+        return embed(operator, qubit_index, self.subsystem_dims)
+
+    def _operator(self, key: Tuple, build) -> sparse.csr_matrix:
+        operator = self._operators.get(key)
+        if operator is None:
+            operator = build()
+            self._operators[key] = operator
+
+        return operator
+
+    def _system_hamiltonian(self) -> sparse.csr_matrix:
+        hamiltonian = sparse.csr_matrix((self.dim, self.dim), dtype=complex)
+        for qubit_index, transmon in enumerate(self.transmons):
+            hamiltonian = hamiltonian + self.embed(transmon.system_hamiltonian(), qubit_index)
+
+        return hamiltonian + self._interaction_hamiltonian()
+
+    def _interaction_hamiltonian(self) -> sparse.csr_matrix:
+        interaction = sparse.csr_matrix((self.dim, self.dim), dtype=complex)
+        for coupling in self.couplings:
+            i, j = coupling.qubit_1_index, coupling.qubit_2_index
+            x_i = self.ladder_operator(i) + self.ladder_operator_dag(i)
+            x_j = self.ladder_operator(j) + self.ladder_operator_dag(j)
+            interaction = interaction + 2 * np.pi * coupling.coupling_strength * (x_i @ x_j)
+
+        return interaction.tocsr()
+
+
+class TransmonChain(TransmonLattice):
+    """ Transmons coupled to their nearest neighbours along a line. """
+    def __init__(self, settings: TransmonChainSettings):
+        super().__init__(settings.to_lattice_settings())
+        self.settings = settings
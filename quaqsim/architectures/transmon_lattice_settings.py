@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import List
+
+from dataclasses_json import dataclass_json
+
+from .transmon_settings import TransmonSettings
+
+
+@dataclass_json
+@dataclass
+class TransmonCoupling:
+    qubit_1_index: int
+    qubit_2_index: int
+    coupling_strength: float
+
+
+@dataclass_json
+@dataclass
+class TransmonLatticeSettings:
+    transmon_settings: List[TransmonSettings]
+    couplings: List[TransmonCoupling]
+
+
+@dataclass_json
+@dataclass
+class TransmonChainSettings:
+    transmon_settings: List[TransmonSettings]
+    # coupling strength between transmon i and i + 1
+    coupling_strengths: List[float]
+
+    def to_lattice_settings(self) -> TransmonLatticeSettings:
+        if len(self.coupling_strengths) != len(self.transmon_settings) - 1:
+            raise ValueError(f"Expected {len(self.transmon_settings) - 1} coupling strengths for a chain of "
+                             f"{len(self.transmon_settings)} transmons, got {len(self.coupling_strengths)}")
+
+        return TransmonLatticeSettings(
+            transmon_settings=self.transmon_settings,
+            couplings=[
+                TransmonCoupling(i, i + 1, coupling_strength)
+                for i, coupling_strength in enumerate(self.coupling_strengths)
+            ]
+        )
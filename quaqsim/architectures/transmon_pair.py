@@ -1,15 +1,21 @@
+from typing import List
+
 import numpy as np
 
-from .operators import a0, a0dag, a1, a1dag, ident
+from .operators import a0, a0dag, a1, a1dag, dim, ident
 from .transmon import Transmon
 from .transmon_pair_settings import TransmonPairSettings
 
 
 class TransmonPair:
     def __init__(self, settings: TransmonPairSettings):
+        self.settings = settings
         self.transmon_1 = Transmon(settings.transmon_1_settings)
         self.transmon_2 = Transmon(settings.transmon_2_settings)
         self.coupling_strength = settings.coupling_strength
+        if self.transmon_1.dim != dim or self.transmon_2.dim != dim:
+            raise ValueError(f"TransmonPair simulates {dim} levels per transmon, use TransmonLattice for other truncations.")
+        self.subsystem_dims = [dim, dim]
 
     def system_hamiltonian(self) -> np.ndarray:
         transmon_1_system_hamiltonian = np.kron(ident, self.transmon_1.system_hamiltonian())
@@ -27,3 +33,6 @@ class TransmonPair:
     def transmon_2_drive_operator(self, quadrature="I"):
         return np.kron(self.transmon_2.drive_operator(quadrature), ident)
 
+    def static_dissipators(self) -> List[np.ndarray]:
+        return [np.kron(ident, dissipator) for dissipator in self.transmon_1.dissipators()] + \
+            [np.kron(dissipator, ident) for dissipator in self.transmon_2.dissipators()]
@@ -1,41 +1,259 @@
+import copy
+import dataclasses
+
 import jax
-from typing import Dict, Literal
+import numpy as np
+from typing import Dict, Iterable, List, Literal, Optional, Tuple, Union
+from scipy import sparse
+
+from jax.experimental import sparse as jsparse
+from qiskit_dynamics import DynamicsBackend
+from qiskit_dynamics.models import LindbladModel
 
-from qiskit_dynamics import Solver, DynamicsBackend
+from .batched_solver import BatchedSolver
+from .compilation_cache import compilation_cache_key, get_compilation_cache_stats, CompilationCacheStats
 from .from_qua_channels import TransmonPairBackendChannel, TransmonPairBackendChannelReadout, \
     TransmonPairBackendChannelIQ, ChannelType
-from .operators import dim
+from .transmon_lattice import TransmonLattice
+from .subsystem_reduction import ReducedSystem
 from .transmon_pair import TransmonPair
 
 Element = str
 ConfigToTransmonPairBackendMap = Dict[Element, TransmonPairBackendChannel]
+ArrayLibrary = Literal['jax', 'jax_sparse']
+
+# Hilbert space dimension from which sparse operators are used by default. In
+# `benchmarks/sparse_crossover.py` the dense solver is faster up to dimension 144, and
+# the sparse one from dimension 243 on.
+SPARSE_DIM_THRESHOLD = 192
+
+# Maximum solver step (in units of `dt`) in the rotating wave approximation, where the
+# generator only varies with the pulse envelopes. It is the shortest QUA pulse (4 clock
+# cycles), so that no pulse is stepped over. See `benchmarks/rwa_accuracy.py`.
+RWA_MAX_STEP = 16
 
 
 class TransmonPairBackendFromQUA(DynamicsBackend):
     def __init__(self,
-                 transmon_pair: TransmonPair,
+                 transmon_pair: Union[TransmonPair, TransmonLattice, ReducedSystem],
                  config_to_backend_map: ConfigToTransmonPairBackendMap,
                  platform: Literal['cpu', 'gpu'] = 'cpu',
                  _dt: float = 1 / 4.5e9,
+                 compilation_cache_dir: Optional[str] = None,
+                 analytic_segments: bool = False,
+                 analytic_idle: bool = True,
+                 array_library: Optional[ArrayLibrary] = None,
+                 sparse_dim_threshold: int = SPARSE_DIM_THRESHOLD,
+                 rwa: bool = False,
                  **options):
         jax.config.update("jax_enable_x64", True)
         jax.config.update("jax_platform_name", platform)
 
+        # picklable arguments from which an identical backend can be rebuilt
+        self._settings = dict(
+            transmon_pair=transmon_pair,
+            config_to_backend_map=config_to_backend_map,
+            platform=platform,
+            _dt=_dt,
+            compilation_cache_dir=compilation_cache_dir,
+            analytic_segments=analytic_segments,
+            analytic_idle=analytic_idle,
+            array_library=array_library,
+            sparse_dim_threshold=sparse_dim_threshold,
+            rwa=rwa,
+            **options
+        )
+
         self._dt = _dt
 
         self.transmon_pair = transmon_pair
         self.config_to_backend_map = config_to_backend_map
+        subsystem_dims = transmon_pair.subsystem_dims
+        for element, channel in config_to_backend_map.items():
+            if channel.qubit_index >= len(subsystem_dims):
+                raise ValueError(f"Element {element} is on qubit {channel.qubit_index}, "
+                                 f"but the architecture only has {len(subsystem_dims)} qubits")
+
+        # a Lindblad equation evolves the vectorized density matrix, of the squared dimension
+        solve_dim = int(np.prod(subsystem_dims)) ** (2 if transmon_pair.static_dissipators() else 1)
+        if array_library is None:
+            array_library = 'jax_sparse' if solve_dim >= sparse_dim_threshold else 'jax'
+        if array_library not in ['jax', 'jax_sparse']:
+            raise ValueError(f"Expected array_library to be 'jax' or 'jax_sparse', got {array_library}")
+        self.array_library = array_library
+        # the cutoff of the rotating wave approximation is the lowest carrier frequency, and
+        # baseband channels (of carrier 0) do not rotate, so without any carrier the full model is kept
+        self._rwa_cutoff_freq = min((
+            channel.carrier_frequency for channel in config_to_backend_map.values()
+            if isinstance(channel, TransmonPairBackendChannelIQ) and channel.carrier_frequency > 0
+        ), default=None) if rwa else None
+        self.rwa = self._rwa_cutoff_freq is not None
+        # backends simulating a subset of the qubits, built on first use, or None if they cannot be
+        self._reduced_backends: Dict[Tuple[int, ...], Optional[TransmonPairBackendFromQUA]] = {}
         solver = self._solver_from_map()
+        # propagate constant pulse segments by powers of a cached one-period propagator
+        solver.analytic_segments = analytic_segments
+        # propagate idle windows (e.g. waits) by the static Hamiltonian instead of integrating them
+        solver.analytic_idle = analytic_idle
 
         options = {"method": "jax_odeint",
                    "atol": 1e-6,
                    "rtol": 1e-8,
-                   "hmax": self._dt,
+                   "hmax": self._dt * (RWA_MAX_STEP if self.rwa else 1),
                    **options}
 
-        super().__init__(solver=solver, subsystem_dims=[dim, dim], solver_options=options)
+        # opt-in persistent cache of the compiled solver kernels, shared between processes
+        if compilation_cache_dir is not None:
+            solver.compilation_cache_dir = compilation_cache_dir
+            solver.compilation_cache_key = compilation_cache_key(
+                dim=solver.model.dim,
+                num_channels=len(solver._hamiltonian_channels),
+                method=options["method"],
+                atol=options.get("atol"),
+                rtol=options.get("rtol"),
+                hmax=options.get("hmax"),
+                platform=platform,
+                array_library=array_library,
+                lindblad=isinstance(solver.model, LindbladModel),
+                rwa=self.rwa,
+            )
+
+        super().__init__(solver=solver, subsystem_dims=subsystem_dims, solver_options=options)
+
+    def compilation_cache_stats(self) -> CompilationCacheStats:
+        solver = self.options.solver
+        if solver.compilation_cache_dir is None:
+            raise ValueError("The persistent compilation cache is not enabled for this backend.")
+
+        return get_compilation_cache_stats(solver.compilation_cache_dir, solver.compilation_cache_key)
+
+    def reduced_to(self, qubits: Iterable[int], coupling_threshold: float) -> 'TransmonPairBackendFromQUA':
+        """
+        A backend simulating only `qubits`, with the other qubits left in their ground state,
+        if they are coupled to `qubits` by at most `coupling_threshold` (in Hz) and no element
+        on `qubits` drives them. Otherwise, or if no qubit is idle, this backend. The reduced
+        backend has the options of this one, and is only used from the ground state.
+        """
+        qubits = tuple(sorted(set(qubits)))
+        if len(qubits) == 0 or len(qubits) == len(self.options.subsystem_dims):
+            return self
+        # a custom initial state may excite the idle qubits
+        if not (isinstance(self.options.initial_state, str) and self.options.initial_state == "ground_state"):
+            return self
+
+        reduced_system = ReducedSystem(self.transmon_pair, qubits)
+        if reduced_system.coupling_to_idle_qubits() > coupling_threshold:
+            return self
+
+        if qubits not in self._reduced_backends:
+            self._reduced_backends.setdefault(qubits, self._reduced_backend(reduced_system))
+
+        return self._reduced_backends[qubits] or self
+
+    def _reduced_backend(self, reduced_system: ReducedSystem) -> Optional['TransmonPairBackendFromQUA']:
+        for channel in self.config_to_backend_map.values():
+            if isinstance(channel, TransmonPairBackendChannelIQ) and channel.qubit_index in reduced_system.qubits:
+                if not (reduced_system.acts_within(channel.operator_i) and reduced_system.acts_within(channel.operator_q)):
+                    return None
+
+        # every element is kept, so that the channels are named as on this backend
+        reduced_map = {
+            element: dataclasses.replace(
+                channel,
+                operator_i=reduced_system.reduce(channel.operator_i),
+                operator_q=reduced_system.reduce(channel.operator_q)
+            ) if isinstance(channel, TransmonPairBackendChannelIQ) else dataclasses.replace(channel)
+            for element, channel in self.config_to_backend_map.items()
+        }
+
+        reduced_settings = {**self._settings, "transmon_pair": reduced_system, "config_to_backend_map": reduced_map}
+        options = self._rebuild_options()
+        del options["subsystem_dims"]
+
+        return _rebuild_backend(self.__class__, reduced_settings, options)
+
+    def set_options(self, **fields):
+        super().set_options(**fields)
+        # the reduced backends were built with the previous options. A new dictionary is
+        # assigned rather than cleared, as the old one may be shared with copies of this backend.
+        self._reduced_backends = {}
+
+    def __reduce__(self):
+        # the jax solver cannot be pickled, so rebuild the backend from its settings instead,
+        # along with the options set on it since (e.g. `seed_simulator` or `initial_state`)
+        return _rebuild_backend, (self.__class__, self._settings, self._rebuild_options())
+
+    def _rebuild_options(self) -> dict:
+        """ The options to set on a backend rebuilt from `_settings`, which builds its own solver. """
+        return {
+            name: value for name, value in self.options.items()
+            if name != "solver" and not (name in ["configuration", "defaults"] and value is None)
+        }
+
+    def __deepcopy__(self, memo):
+        # `DynamicsBackend.run` deep-copies the backend when given options, which must not go
+        # through `__reduce__` and rebuild the solver.
+        backend = self.__class__.__new__(self.__class__)
+        memo[id(self)] = backend
+        for name, value in self.__dict__.items():
+            # the reduced backends are never modified, and are shared with the copy
+            setattr(backend, name, value if name == "_reduced_backends" else copy.deepcopy(value, memo))
+
+        return backend
 
     def _solver_from_map(self):
+        hamiltonian_operators, hamiltonian_channels, channel_carrier_freqs = \
+            self.assign_channel_indices(self.config_to_backend_map)
+
+        system_hamiltonian = self.transmon_pair.system_hamiltonian()
+        static_dissipators = self.transmon_pair.static_dissipators()
+        if self.array_library == 'jax' and isinstance(self.transmon_pair, TransmonPair) and not self.rwa:
+            system_hamiltonian = _dense(system_hamiltonian)
+            rotating_frame = system_hamiltonian
+        else:
+            # rotating into the eigenbasis of a larger coupled Hamiltonian makes every operator
+            # dense, and the static Hamiltonian `DynamicsBackend` (or the rotating wave
+            # approximation) rebuilds from that frame is no longer Hermitian to its tolerance,
+            # so the frame is only its diagonal, as for `DynamicsBackend.from_backend`
+            rotating_frame = np.real(_diagonal(system_hamiltonian))
+
+        if self.array_library == 'jax_sparse' and not static_dissipators:
+            system_hamiltonian = _bcoo(system_hamiltonian)
+            hamiltonian_operators = _bcoo_stack(hamiltonian_operators)
+            static_dissipators = None
+        else:
+            # a Lindblad model only takes dense operators, from which it builds sparse
+            # superoperators itself with 'jax_sparse'
+            system_hamiltonian = _dense(system_hamiltonian)
+            hamiltonian_operators = [_dense(operator) for operator in hamiltonian_operators]
+            static_dissipators = [_dense(dissipator) for dissipator in static_dissipators] or None
+
+        solver = BatchedSolver(
+            static_hamiltonian=system_hamiltonian,
+            hamiltonian_operators=hamiltonian_operators,
+            # with T1 or T2, the density matrix is evolved by a Lindblad equation, vectorized so
+            # that its dissipators are precomputed as superoperators
+            static_dissipators=static_dissipators,
+            vectorized=static_dissipators is not None,
+            rotating_frame=rotating_frame,
+            hamiltonian_channels=hamiltonian_channels,
+            channel_carrier_freqs=channel_carrier_freqs,
+            dt=self._dt,
+            array_library=self.array_library,
+            # in the frame of the transmons, the counter-rotating terms oscillate at about twice
+            # the carrier frequencies, and every other term at most at their detunings
+            rwa_cutoff_freq=self._rwa_cutoff_freq,
+        )
+
+        return solver
+
+    @staticmethod
+    def assign_channel_indices(config_to_backend_map: ConfigToTransmonPairBackendMap) \
+            -> Tuple[List[np.ndarray], List[str], Dict[str, float]]:
+        """
+        Assign pulse channel indices to each channel in the map, returning the operators,
+        names and carrier frequencies of the resulting hamiltonian channels.
+        """
         hamiltonian_operators = []
         hamiltonian_channels = []
         channel_carrier_freqs = {}
@@ -43,7 +261,7 @@ class TransmonPairBackendFromQUA(DynamicsBackend):
 
         drive_index = -1
         control_index = -1
-        for element, channel in self.config_to_backend_map.items():
+        for element, channel in config_to_backend_map.items():
             if isinstance(channel, TransmonPairBackendChannelIQ):
                 for quadrature, operator in zip("IQ", [channel.operator_i, channel.operator_q]):
                     if channel.type == ChannelType.DRIVE:
@@ -67,14 +285,26 @@ class TransmonPairBackendFromQUA(DynamicsBackend):
             else:
                 raise NotImplementedError()
 
-        solver = Solver(
-            static_hamiltonian=self.transmon_pair.system_hamiltonian(),
-            hamiltonian_operators=hamiltonian_operators,
-            rotating_frame=self.transmon_pair.system_hamiltonian(),
-            hamiltonian_channels=hamiltonian_channels,
-            channel_carrier_freqs=channel_carrier_freqs,
-            dt=self._dt,
-            array_library="jax",
-        )
+        return hamiltonian_operators, hamiltonian_channels, channel_carrier_freqs
 
-        return solver
+
+def _rebuild_backend(cls, settings: dict, options: dict) -> TransmonPairBackendFromQUA:
+    backend = cls(**settings)
+    backend.set_options(**options)
+    return backend
+
+
+def _dense(operator) -> np.ndarray:
+    return operator.toarray() if sparse.issparse(operator) else np.asarray(operator)
+
+
+def _diagonal(operator) -> np.ndarray:
+    return operator.diagonal() if sparse.issparse(operator) else np.diag(operator)
+
+
+def _bcoo(operator) -> jsparse.BCOO:
+    return jsparse.BCOO.from_scipy_sparse(sparse.csr_matrix(operator, dtype=complex))
+
+
+def _bcoo_stack(operators) -> jsparse.BCOO:
+    return jsparse.bcoo_concatenate([_bcoo(operator)[None] for operator in operators], dimension=0)
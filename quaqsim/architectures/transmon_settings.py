@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from typing import Optional
+
 from dataclasses_json import dataclass_json
 
 
@@ -8,3 +10,8 @@ class TransmonSettings:
     resonant_frequency: float
     anharmonicity: float
     rabi_frequency: float
+    # number of transmon levels simulated
+    dim: int = 3
+    # energy relaxation and coherence times (in seconds), None for no relaxation or dephasing
+    t1: Optional[float] = None
+    t2: Optional[float] = None
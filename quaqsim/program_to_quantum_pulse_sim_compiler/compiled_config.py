@@ -0,0 +1,113 @@
+import functools
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .resampling import ResamplingMethod, resample
+
+Element = str
+Operation = str
+
+
+@dataclass(frozen=True)
+class WaveformRecord:
+    """ A constant waveform holds its single sample, an arbitrary one all of its samples. """
+    name: str
+    type: str
+    samples: np.ndarray
+
+
+@dataclass(frozen=True)
+class OperationRecord:
+    pulse_name: str
+    length: int
+    I: WaveformRecord
+    Q: WaveformRecord
+
+
+class CompiledConfig:
+    """
+    A QUA config validated once, with the pulse and waveforms of every element operation
+    resolved up front so that they can be looked up in O(1) while compiling.
+
+    Operations which cannot be simulated (e.g. pulses without I and Q waveforms) only raise
+    when they are played, as they would from the plain config.
+
+    Arbitrary waveforms played with a different length are resampled with `resampling_method`,
+    and the resampled samples are cached per waveform and length.
+    """
+    def __init__(self, config: dict, resampling_method: ResamplingMethod = 'linear', resampling_cache_size: int = 1024):
+        self.config = config
+        self.resampling_method = resampling_method
+        self._resampled_samples = functools.lru_cache(maxsize=resampling_cache_size)(self._resample)
+        self._operations: Dict[Tuple[Element, Operation], OperationRecord] = {}
+        self._errors: Dict[Tuple[Element, Operation], Exception] = {}
+
+        waveform_records = {}
+        for element, element_config in config.get('elements', {}).items():
+            for operation, pulse_name in element_config.get('operations', {}).items():
+                try:
+                    self._operations[element, operation] = _operation_record(config, pulse_name, waveform_records)
+                except (KeyError, NotImplementedError) as e:
+                    self._errors[element, operation] = e
+
+    def operation(self, element: Element, operation: Operation) -> OperationRecord:
+        record = self._operations.get((element, operation))
+        if record is None:
+            error = self._errors.get((element, operation), KeyError(operation))
+            raise type(error)(*error.args)
+
+        return record
+
+    def resampled_samples(self, waveform: WaveformRecord, length: int) -> np.ndarray:
+        """ The read-only samples of an arbitrary waveform, resampled to `length`. """
+        if length == len(waveform.samples):
+            return waveform.samples
+
+        return self._resampled_samples(waveform.name, length)
+
+    def resampling_cache_info(self):
+        return self._resampled_samples.cache_info()
+
+    def _resample(self, waveform_name: str, length: int) -> np.ndarray:
+        samples = np.array(self.config['waveforms'][waveform_name]['samples'], dtype=float)
+        samples = resample(samples, length, self.resampling_method)
+        samples.flags.writeable = False
+
+        return samples
+
+    def __contains__(self, element_operation: Tuple[Element, Operation]) -> bool:
+        return element_operation in self._operations
+
+
+def _operation_record(config: dict, pulse_name: str, waveform_records: Dict[str, WaveformRecord]) -> OperationRecord:
+    pulse = config['pulses'][pulse_name]
+    waveforms = pulse['waveforms']
+
+    if set(waveforms.keys()) != {'I', 'Q'}:
+        raise NotImplementedError()
+
+    for waveform_name in waveforms.values():
+        if waveform_name not in waveform_records:
+            waveform_records[waveform_name] = _waveform_record(waveform_name, config['waveforms'][waveform_name])
+
+    return OperationRecord(
+        pulse_name=pulse_name,
+        length=pulse['length'],
+        I=waveform_records[waveforms['I']],
+        Q=waveform_records[waveforms['Q']],
+    )
+
+
+def _waveform_record(name: str, waveform_config: dict) -> WaveformRecord:
+    waveform_type = waveform_config['type']
+    if waveform_type == 'constant':
+        samples = np.array([waveform_config['sample']], dtype=float)
+    elif waveform_type == 'arbitrary':
+        samples = np.array(waveform_config['samples'], dtype=float)
+    else:
+        raise NotImplementedError()
+    samples.flags.writeable = False
+
+    return WaveformRecord(name=name, type=waveform_type, samples=samples)
@@ -1,35 +1,43 @@
 from quaqsim.architectures.from_qua_channels import TransmonPairBackendChannelIQ, \
     TransmonPairBackendChannelReadout
 from quaqsim.architectures.transmon_pair_backend_from_qua import ConfigToTransmonPairBackendMap
+from quaqsim.program_to_quantum_pulse_sim_compiler.compiled_config import CompiledConfig
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_IQ import TimelineIQ
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_schedules import \
     TimelineSchedules
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_single import \
     TimelineSingle
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.pulses import WaveformCache
 
 Element = str
 
 
 class Context:
-    def __init__(self, qua_config: dict):
+    def __init__(self, qua_config: dict | CompiledConfig, waveform_cache: WaveformCache = None):
         self.vars = {}
-        self.qua_config: dict = qua_config
+        self.compiled_config: CompiledConfig = (
+            qua_config if isinstance(qua_config, CompiledConfig) else CompiledConfig(qua_config)
+        )
+        self.qua_config: dict = self.compiled_config.config
+        self.waveform_cache: WaveformCache = waveform_cache if waveform_cache is not None else WaveformCache()
         self.schedules: TimelineSchedules = TimelineSchedules()
 
     def create_timelines_for_each_element(self, channel_map: ConfigToTransmonPairBackendMap):
         for element, channel in channel_map.items():
             if isinstance(channel, TransmonPairBackendChannelIQ):
-                self.schedules.map[element] = [
+                self.schedules.add_element(
+                    element,
                     TimelineIQ(
                         qubit_index=channel.qubit_index,
                         pulse_channel_i=channel.get_qiskit_pulse_channel(quadrature='I'),
                         pulse_channel_q=channel.get_qiskit_pulse_channel(quadrature='Q'),
                     )
-                ]
+                )
             elif isinstance(channel, TransmonPairBackendChannelReadout):
-                self.schedules.map[element] = [
+                self.schedules.add_element(
+                    element,
                     TimelineSingle(
                         qubit_index=channel.qubit_index,
                         pulse_channel=channel.get_qiskit_pulse_channel()
                     )
-                ]
+                )
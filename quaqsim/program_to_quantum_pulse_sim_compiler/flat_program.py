@@ -0,0 +1,98 @@
+from enum import IntEnum
+from typing import Any, List, NamedTuple, Optional
+
+from .context import Context
+from .visitors.definition_visitor import DefinitionVisitor
+from .visitors.expression_visitors.expression_compiler import compile_expression
+from .visitors.node_visitor import node_visitors
+from ..program_ast._for import For
+from ..program_ast._if import If
+from ..program_ast.expressions.definition import Definition
+from ..program_ast.program import Program
+
+
+class Opcode(IntEnum):
+    EXECUTE = 0
+    JUMP = 1
+    JUMP_IF_FALSE = 2
+
+
+class Instruction(NamedTuple):
+    """
+    EXECUTE calls the compiled statement `operand(context)` of `node`, JUMP continues at `target`,
+    and JUMP_IF_FALSE continues at `target` if the compiled condition `operand` is false.
+    """
+    opcode: Opcode
+    operand: Any = None
+    node: Any = None
+    target: Optional[int] = None
+
+
+class FlatProgram(NamedTuple):
+    definitions: List[Definition]
+    instructions: List[Instruction]
+
+
+def lower(program: Program) -> FlatProgram:
+    """
+    Lower a program AST into a linear list of instructions, in which `for_` and `if_` blocks
+    become conditional jumps. The tree is walked with an explicit stack rather than recursively,
+    so arbitrarily deep nesting is supported. Statements and conditions are compiled into closures
+    here, once per node.
+    """
+    instructions = []
+
+    def close_for(start: int, branch: int):
+        instructions.append(Instruction(Opcode.JUMP, target=start))
+        instructions[branch] = instructions[branch]._replace(target=len(instructions))
+
+    def close_if(branch: int):
+        instructions[branch] = instructions[branch]._replace(target=len(instructions))
+
+    # the nodes left to lower in each open block, and how to close the block once they are
+    stack = [(iter(program.body), None)]
+    while stack:
+        nodes, close = stack[-1]
+        node = next(nodes, None)
+        if node is None:
+            stack.pop()
+            if close is not None:
+                close()
+            continue
+
+        if type(node) is For:
+            branch = len(instructions)
+            instructions.append(Instruction(Opcode.JUMP_IF_FALSE, compile_expression(node.cond), node))
+            stack.append((iter(node.body), lambda start=branch, branch=branch: close_for(start, branch)))
+
+        elif type(node) is If:
+            branch = len(instructions)
+            instructions.append(Instruction(Opcode.JUMP_IF_FALSE, compile_expression(node.cond), node))
+            stack.append((iter(node.body), lambda branch=branch: close_if(branch)))
+
+        elif type(node) in node_visitors:
+            instructions.append(Instruction(Opcode.EXECUTE, node_visitors[type(node)].compile(node), node))
+
+        else:
+            raise NotImplementedError(f"Unrecognised node type {type(node)}")
+
+    return FlatProgram(definitions=program.vars, instructions=instructions)
+
+
+def interpret(flat_program: FlatProgram, context: Context):
+    """ Run the lowered program, adding its instructions to the timelines of the context. """
+    for definition in flat_program.definitions:
+        context.vars.update(DefinitionVisitor().visit(definition))
+
+    instructions = flat_program.instructions
+    num_instructions = len(instructions)
+    pc = 0
+    while pc < num_instructions:
+        opcode, operand, node, target = instructions[pc]
+        if opcode is Opcode.EXECUTE:
+            operand(context)
+            pc += 1
+        elif opcode is Opcode.JUMP_IF_FALSE:
+            pc = pc + 1 if operand(context) else target
+        else:
+            pc = target
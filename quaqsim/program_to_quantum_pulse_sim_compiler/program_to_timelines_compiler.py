@@ -1,19 +1,26 @@
+from .compiled_config import CompiledConfig
 from .context import Context
 from .schedules.timeline_schedules import TimelineSchedules
 from ..architectures.transmon_pair_backend_from_qua import ConfigToTransmonPairBackendMap
 from ..program_ast.program import Program
-from .visitors.program_visitor import ProgramVisitor
+from .flat_program import interpret, lower
+from .visitors.pulses import WaveformCache
 
 
 class ProgramToTimelinesCompiler:
+    def __init__(self, waveform_cache: WaveformCache = None):
+        self.waveform_cache = waveform_cache
+
     def compile(self,
-                qua_config: dict,
+                qua_config: dict | CompiledConfig,
                 program_tree: Program,
                 channel_map: ConfigToTransmonPairBackendMap) -> TimelineSchedules:
 
         # compile the program AST into a runnable qiskit pulse simulator
-        context = Context(qua_config=qua_config)
+        context = Context(qua_config=qua_config, waveform_cache=self.waveform_cache)
         context.create_timelines_for_each_element(channel_map)
-        program_tree.accept(ProgramVisitor(), context)
+        # lower the tree into a flat list of instructions, which is faster to run than walking the
+        # tree with the visitors in `ProgramVisitor` at every loop iteration
+        interpret(lower(program_tree), context)
 
         return context.schedules
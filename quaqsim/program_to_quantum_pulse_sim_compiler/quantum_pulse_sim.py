@@ -1,14 +1,26 @@
-from typing import List
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from qiskit.pulse import Schedule
 from qiskit.visualization.pulse_v2 import IQXDebugging
 from qiskit_dynamics import DynamicsBackend
 
+from quaqsim.architectures.batched_solver import BatchedSolver
+from quaqsim.architectures.solver_policy import AccuracyCheck, SolverPolicy
+from quaqsim.program_to_quantum_pulse_sim_compiler.readout import OutcomeProbabilities, Populations, \
+    final_state_probabilities, populations_from_probabilities, sample_probabilities
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedule_fingerprint import deduplicate_schedules
+
 
 class QuantumPulseSimulator:
-    def __init__(self, backend: DynamicsBackend, schedules: List):
+    def __init__(self, backend: DynamicsBackend, schedules: List, num_removed_instructions: int = 0):
         self.backend = backend
         self.schedules: List[Schedule] = schedules
+        # timeline instructions removed by the compiler's peephole optimization
+        self.num_removed_instructions = num_removed_instructions
 
     def plot_schedule(self, index: int):
         from qiskit.visualization.pulse_v2 import draw
@@ -29,26 +41,217 @@ class QuantumPulseSimulator:
             axis=None,
         )
 
-    def run(self, num_shots: int) -> List[List[float]]:
-        job = self.backend.run(self.schedules, shots=num_shots)
-        result = job.result()
-
-        results = []
-        for i in range(len(self.schedules)):
-            counts = result.get_counts(i)
-            num_measured_qubits = len(list(counts.keys())[0])
-            if num_measured_qubits == 1:
-                results.append((
-                    counts.get('0', 0) / num_shots,
-                ))
-            elif num_measured_qubits == 2:
-                results.append((
-                    # 1 - zero population is better for reproducing leakage induced
-                    # readout errors assuming '2' is a valid state
-                    1 - (counts.get('10', 0) / num_shots + counts.get('00', 0) / num_shots),
-                    1 - (counts.get('01', 0) / num_shots + counts.get('00', 0) / num_shots),
-                ))
-            else:
-                raise NotImplementedError(f"{num_measured_qubits} not supported yet.")
+    def run(self,
+            num_shots: Optional[int],
+            batched: bool = False,
+            workers: Optional[int] = None,
+            exact_readout: bool = False,
+            deduplicate: bool = True,
+            solver_policy: Optional[SolverPolicy] = None) -> List[List[float]]:
+        """
+        Simulate every schedule and return the measured population of each qubit per schedule.
+
+        If `num_shots` is None, the populations are computed exactly from the final state of
+        the solver. With `exact_readout=True`, the shots are instead drawn from these exact
+        populations in a single multinomial call, rather than sampled by the backend.
+
+        With `deduplicate=True`, identical schedules (e.g. from an averaging loop) are only
+        simulated once, and each duplicate draws its own `num_shots` shots from the result.
+        If any schedule is duplicated, the shots of every schedule are then drawn from the exact
+        populations with numpy (seeded by the backend's `seed_simulator`) rather than by the
+        backend's sampler, so that seeded counts differ from those with `deduplicate=False`.
+
+        With a `solver_policy`, the solver tolerances are loosened to what `num_shots` can resolve.
+        """
+        self._validate_batched(batched)
+
+        results = self._simulate(
+            self.schedules, num_shots, batched, workers, exact_readout,
+            known_probabilities={} if deduplicate else None,
+            solver_options=self._solver_options(solver_policy, num_shots),
+        )
 
         return list(zip(*results))
+
+    def run_iter(self,
+                 num_shots: Optional[int],
+                 batched: bool = False,
+                 exact_readout: bool = False,
+                 deduplicate: bool = True,
+                 chunk_size: int = 1,
+                 solver_policy: Optional[SolverPolicy] = None) -> Iterator[Tuple[int, Populations]]:
+        """
+        Simulate the schedules `chunk_size` at a time, yielding `(schedule_index, populations)`
+        as soon as each chunk has finished. Closing the generator stops the simulation before
+        the next chunk, and only one chunk of results is held at a time.
+
+        With `deduplicate=True`, the outcome probabilities of every unique schedule are kept so
+        that later duplicates are not simulated again, and shots are always drawn from them.
+        """
+        self._validate_batched(batched)
+
+        known_probabilities = {} if deduplicate else None
+        solver_options = self._solver_options(solver_policy, num_shots)
+        # one generator for the whole stream, so that seeded chunks draw different shots
+        rng = np.random.default_rng(self.backend.options.seed_simulator)
+        for start in range(0, len(self.schedules), chunk_size):
+            chunk = self.schedules[start:start + chunk_size]
+            results = self._simulate(
+                chunk, num_shots, batched, None, exact_readout, known_probabilities, rng=rng,
+                solver_options=solver_options,
+            )
+            for i, populations in enumerate(results):
+                yield start + i, populations
+
+    def check_accuracy(self,
+                       solver_policy: SolverPolicy,
+                       num_shots: Optional[int],
+                       num_schedules: int = 3) -> AccuracyCheck:
+        """
+        Compare the exact populations of a few evenly spaced schedules simulated with
+        `solver_policy` against a reference run with the backend's own solver options.
+        """
+        precision = solver_policy.target_precision(num_shots)
+        if precision is None:
+            raise ValueError("The accuracy of a solver policy can only be checked against a target precision.")
+
+        indices = np.unique(np.linspace(0, len(self.schedules) - 1, num_schedules).round().astype(int))
+        schedules = [self.schedules[i] for i in indices]
+
+        populations = self._simulate(
+            schedules, None, False, None, True, None,
+            solver_options=self._solver_options(solver_policy, num_shots),
+        )
+        reference_populations = self._simulate(schedules, None, False, None, True, None)
+
+        return AccuracyCheck(
+            max_error=float(np.max(np.abs(np.array(populations) - np.array(reference_populations)))),
+            precision=precision,
+        )
+
+    def _solver_options(self, solver_policy: Optional[SolverPolicy], num_shots: Optional[int]) -> Optional[dict]:
+        if solver_policy is None:
+            return None
+
+        return {
+            **self.backend.options.solver_options,
+            **solver_policy.solver_options(num_shots, self.backend.options.solver._dt),
+        }
+
+    def _validate_batched(self, batched: bool):
+        if batched and not isinstance(self.backend.options.solver, BatchedSolver):
+            raise ValueError("Batched simulation requires a backend built on a BatchedSolver.")
+
+    def _simulate(self,
+                  schedules: List[Schedule],
+                  num_shots: Optional[int],
+                  batched: bool,
+                  workers: Optional[int],
+                  exact_readout: bool,
+                  known_probabilities: Optional[Dict[str, OutcomeProbabilities]],
+                  rng: Optional[np.random.Generator] = None,
+                  solver_options: Optional[dict] = None) -> List[Populations]:
+        """
+        Simulate `schedules`, reusing and filling `known_probabilities` (keyed by schedule
+        fingerprint) unless it is None, in which case no deduplication is done.
+
+        Shots are drawn from `rng` if given, which also keeps them off the backend so that
+        the probabilities of every schedule end up in `known_probabilities`.
+        """
+        if known_probabilities is None:
+            fingerprints = None
+            new_schedules = dict(enumerate(schedules))
+        else:
+            unique_schedules, fingerprints = deduplicate_schedules(schedules)
+            new_schedules = {
+                fingerprint: schedule for fingerprint, schedule in unique_schedules.items()
+                if fingerprint not in known_probabilities
+            }
+
+        # without duplicates, keep sampling shots on the backend
+        sample_on_backend = num_shots is not None and not exact_readout and rng is None
+        if sample_on_backend and len(new_schedules) == len(schedules):
+            return self._map_schedules(_run_schedules, schedules, workers, num_shots, batched, solver_options)
+
+        new_probabilities = self._map_schedules(
+            final_state_probabilities, list(new_schedules.values()), workers, batched, solver_options
+        )
+        if known_probabilities is None:
+            probabilities = new_probabilities
+        else:
+            known_probabilities.update(zip(new_schedules.keys(), new_probabilities))
+            probabilities = [known_probabilities[fingerprint] for fingerprint in fingerprints]
+
+        if num_shots is not None:
+            seed = self.backend.options.seed_simulator if rng is None else rng
+            probabilities = sample_probabilities(probabilities, num_shots, seed=seed)
+
+        return [populations_from_probabilities(p) for p in probabilities]
+
+    def _map_schedules(self, fn: Callable, schedules: List[Schedule], workers: Optional[int], *args) -> List:
+        """ Apply `fn(backend, schedules, *args)`, in a process pool if `workers` > 1, keeping the schedule order. """
+        if len(schedules) == 0:
+            return []
+        if workers is None or workers <= 1:
+            return fn(self.backend, schedules, *args)
+
+        # contiguous chunks so that concatenating the results preserves the schedule order
+        chunks = [
+            list(chunk) for chunk in np.array_split(np.arange(len(schedules)), workers)
+            if len(chunk) > 0
+        ]
+
+        # a seeded backend draws independent shots in each chunk, from seeds derived from its own
+        seed = self.backend.options.seed_simulator
+        if seed is None:
+            chunk_seeds = [None] * len(chunks)
+        else:
+            chunk_seeds = [
+                int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(chunks))
+            ]
+
+        # spawn rather than fork, since jax is multithreaded. Each worker rebuilds its own
+        # backend when unpickling it from its settings and options.
+        with ProcessPoolExecutor(max_workers=len(chunks),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(_with_seed, fn, self.backend, chunk_seed, [schedules[i] for i in chunk], *args)
+                for chunk, chunk_seed in zip(chunks, chunk_seeds)
+            ]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+
+        return results
+
+
+def _with_seed(fn: Callable, backend: DynamicsBackend, seed: Optional[int], schedules: List[Schedule], *args):
+    # the backend is the worker's own copy, so its seed can be changed in place
+    if seed is not None:
+        backend.set_options(seed_simulator=seed)
+
+    return fn(backend, schedules, *args)
+
+
+def _run_schedules(backend: DynamicsBackend,
+                   schedules: List[Schedule],
+                   num_shots: int,
+                   batched: bool = False,
+                   solver_options: Optional[dict] = None) -> List[Populations]:
+    options = {"shots": num_shots}
+    if solver_options is not None:
+        options["solver_options"] = solver_options
+    if batched:
+        options["solver_options"] = {**options.get("solver_options", backend.options.solver_options), "batched": True}
+
+    job = backend.run(schedules, **options)
+    result = job.result()
+
+    results = []
+    for i in range(len(schedules)):
+        counts = result.get_counts(i)
+        results.append(populations_from_probabilities({
+            outcome: count / num_shots for outcome, count in counts.items()
+        }))
+
+    return results
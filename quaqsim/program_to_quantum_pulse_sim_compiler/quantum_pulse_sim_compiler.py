@@ -1,17 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
 import qm
 from qiskit_dynamics import DynamicsBackend
 
+from .compiled_config import CompiledConfig
 from .program_to_timelines_compiler import ProgramToTimelinesCompiler
 from .quantum_pulse_sim import QuantumPulseSimulator
+from .resampling import ResamplingMethod
+from .timeline_optimizer import TimelinePeepholeOptimizer
 from .timeline_to_schedule_compiler import TimelineToPulseScheduleCompiler
-from ..architectures.transmon_pair_backend_from_qua import ConfigToTransmonPairBackendMap
+from .visitors.pulses import WaveformCache
+from ..architectures.transmon_pair_backend_from_qua import ConfigToTransmonPairBackendMap, TransmonPairBackendFromQUA
 from ..program_ast.program import Program as ProgramAST
 from ..program_dict_to_program_compiler.program_tree_builder import ProgramTreeBuilder
 
 
 class Compiler:
-    def __init__(self, config: dict):
+    """
+    Compiles QUA programs against one config. Each compilation builds its own context and
+    timelines, and the state shared between compilations (the compiled config and the waveform
+    cache) is either read-only or locked, so programs can be compiled concurrently.
+
+    Qubits which a program neither drives nor measures are left out of its simulation if
+    they are coupled to the others by at most `subsystem_reduction_threshold` (in Hz). By
+    default only uncoupled qubits are, and None always simulates every qubit.
+    """
+    def __init__(self,
+                 config: dict,
+                 resampling_method: ResamplingMethod = 'linear',
+                 optimize_timelines: bool = True,
+                 subsystem_reduction_threshold: Optional[float] = 0.):
         self.config = config
+        self.optimize_timelines = optimize_timelines
+        self.subsystem_reduction_threshold = subsystem_reduction_threshold
+        # validated and indexed once, for all the programs compiled against this config
+        self.compiled_config = CompiledConfig(config, resampling_method=resampling_method)
+        # shared by every program compiled against this config
+        self.waveform_cache = WaveformCache()
 
     def compile(self,
                 program: qm.Program | ProgramAST,
@@ -26,12 +52,30 @@ class Compiler:
         )
 
         # Compile the abstract syntax tree into an intermediate, pulse timeline representation
-        timelines = ProgramToTimelinesCompiler().compile(self.config, program_tree, channel_map)
+        timelines = ProgramToTimelinesCompiler(self.waveform_cache).compile(self.compiled_config, program_tree, channel_map)
+
+        # Remove redundant delays and phase changes from the timelines
+        num_removed_instructions = 0
+        if self.optimize_timelines:
+            num_removed_instructions = TimelinePeepholeOptimizer().optimize(timelines)
+
+        # Simulate only the qubits the program uses, with the others left in their ground state
+        if self.subsystem_reduction_threshold is not None and isinstance(backend, TransmonPairBackendFromQUA):
+            backend = backend.reduced_to(timelines.get_active_qubits(), self.subsystem_reduction_threshold)
 
         # Compile the pulse timelines into qiskit.pulse schedules
         schedules = TimelineToPulseScheduleCompiler().compile(timelines, backend)
 
         # Encapsulate pulse schedules and backend in simulator object
-        sim = QuantumPulseSimulator(backend, schedules)
+        sim = QuantumPulseSimulator(backend, schedules, num_removed_instructions=num_removed_instructions)
 
         return sim
+
+    def compile_many(self,
+                     programs: List[qm.Program | ProgramAST],
+                     channel_map: ConfigToTransmonPairBackendMap,
+                     backend: DynamicsBackend,
+                     max_workers: Optional[int] = None) -> List[QuantumPulseSimulator]:
+        """ Compile the programs in a thread pool, returning their simulators in the same order. """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda program: self.compile(program, channel_map, backend), programs))
@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from qiskit.pulse import Schedule
+from qiskit.quantum_info import Statevector, DensityMatrix
+from qiskit_dynamics import DynamicsBackend
+from qiskit_dynamics.backend.backend_utils import _get_memory_slot_probabilities
+from qiskit_dynamics.backend.dynamics_backend import _to_schedule_list, _get_acquire_instruction_timings
+
+Populations = Tuple[float, ...]
+OutcomeProbabilities = Dict[str, float]
+
+
+def populations_from_probabilities(probabilities: OutcomeProbabilities) -> Populations:
+    """ Convert memory slot outcome probabilities (or normalized counts) into per-qubit populations. """
+    num_measured_qubits = len(list(probabilities.keys())[0])
+    if num_measured_qubits == 1:
+        return (
+            probabilities.get('0', 0),
+        )
+    elif num_measured_qubits == 2:
+        return (
+            # 1 - zero population is better for reproducing leakage induced
+            # readout errors assuming '2' is a valid state
+            1 - (probabilities.get('10', 0) + probabilities.get('00', 0)),
+            1 - (probabilities.get('01', 0) + probabilities.get('00', 0)),
+        )
+    else:
+        raise NotImplementedError(f"{num_measured_qubits} not supported yet.")
+
+
+def final_state_probabilities(backend: DynamicsBackend,
+                              schedules: List[Schedule],
+                              batched: bool = False,
+                              solver_options: Optional[dict] = None) -> List[OutcomeProbabilities]:
+    """
+    Solve each schedule up to its measurement and return the exact probabilities of each
+    memory slot outcome, processed in the same way as `DynamicsBackend.run` does before sampling.
+    """
+    schedules, num_memory_slots_list = _to_schedule_list(schedules, backend=backend)
+    t_span_list, measurement_subsystems_list, memory_slot_indices_list = _get_acquire_instruction_timings(
+        schedules, backend.options.subsystem_dims, backend.options.solver._dt
+    )
+
+    y0 = backend.options.initial_state
+    if isinstance(y0, str) and y0 == "ground_state":
+        y0 = Statevector(backend._dressed_states[:, 0])
+
+    solver_options = dict(backend.options.solver_options if solver_options is None else solver_options)
+    if batched:
+        solver_options["batched"] = True
+
+    solver_results = backend.options.solver.solve(
+        t_span=t_span_list, y0=y0, signals=schedules, **solver_options
+    )
+
+    probabilities = []
+    for solver_result, measurement_subsystems, memory_slot_indices, num_memory_slots in zip(
+            solver_results, measurement_subsystems_list, memory_slot_indices_list, num_memory_slots_list):
+        yf = _final_state_in_dressed_basis(backend, solver_result.t[-1], solver_result.y[-1])
+        probabilities.append(_get_memory_slot_probabilities(
+            probability_dict=yf.probabilities_dict(qargs=measurement_subsystems),
+            memory_slot_indices=memory_slot_indices,
+            num_memory_slots=num_memory_slots,
+            max_outcome_value=backend.options.max_outcome_level,
+        ))
+
+    return probabilities
+
+
+def _final_state_in_dressed_basis(backend: DynamicsBackend, tf: float, yf):
+    rotating_frame = backend.options.solver.model.rotating_frame
+    if isinstance(yf, Statevector):
+        yf = np.array(rotating_frame.state_out_of_frame(t=tf, y=yf))
+        yf = Statevector(backend._dressed_states_adjoint @ yf, dims=backend.options.subsystem_dims)
+        if backend.options.normalize_states:
+            yf = yf / np.linalg.norm(yf.data)
+    elif isinstance(yf, DensityMatrix):
+        yf = np.array(rotating_frame.operator_out_of_frame(t=tf, operator=yf))
+        yf = backend._dressed_states_adjoint @ yf @ backend._dressed_states
+        yf = DensityMatrix(yf, dims=backend.options.subsystem_dims)
+        if backend.options.normalize_states:
+            yf = yf / np.diag(yf.data).sum()
+    else:
+        raise NotImplementedError(f"Unrecognised final state type {type(yf)}")
+
+    return yf
+
+
+def sample_probabilities(probabilities: List[OutcomeProbabilities],
+                         num_shots: int,
+                         seed: Optional[Union[int, np.random.Generator]] = None) -> List[OutcomeProbabilities]:
+    """ Draw `num_shots` shots for every schedule at once, returning the normalized counts. """
+    outcomes = sorted({outcome for outcome_probabilities in probabilities for outcome in outcome_probabilities})
+    pvals = np.array([
+        [outcome_probabilities.get(outcome, 0.) for outcome in outcomes]
+        for outcome_probabilities in probabilities
+    ])
+    pvals = np.clip(pvals, 0., None)
+    pvals /= pvals.sum(axis=1, keepdims=True)
+
+    counts = np.random.default_rng(seed).multinomial(num_shots, pvals)
+
+    return [
+        {
+            outcome: count / num_shots
+            for outcome, count in zip(outcomes, schedule_counts)
+            if outcome in outcome_probabilities
+        }
+        for outcome_probabilities, schedule_counts in zip(probabilities, counts)
+    ]
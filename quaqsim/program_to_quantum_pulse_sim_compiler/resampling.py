@@ -0,0 +1,29 @@
+from typing import Literal
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+ResamplingMethod = Literal['linear', 'cubic']
+
+
+def resample(samples: np.ndarray, length: int, method: ResamplingMethod = 'linear') -> np.ndarray:
+    """
+    Resample a waveform to `length` samples. Integer upsampling factors hold each sample
+    (zero-order hold), as the hardware does; any other ratio is interpolated with `method`
+    between the sample centres.
+    """
+    num_samples = len(samples)
+    if length == num_samples:
+        return samples
+
+    if length % num_samples == 0:
+        return np.repeat(samples, length // num_samples)
+
+    # centres of the new samples, in units of the original samples
+    x = np.clip((np.arange(length) + 0.5) * num_samples / length - 0.5, 0, num_samples - 1)
+    if method == 'linear':
+        return np.interp(x, np.arange(num_samples), samples)
+    elif method == 'cubic':
+        return CubicSpline(np.arange(num_samples), samples)(x)
+    else:
+        raise NotImplementedError(f"Unrecognised resampling method {method}")
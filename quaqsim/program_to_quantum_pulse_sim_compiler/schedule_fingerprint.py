@@ -0,0 +1,65 @@
+import hashlib
+import numbers
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from qiskit.pulse import Schedule, ScheduleBlock
+from qiskit.pulse.instructions import Play
+from qiskit.pulse.library import Waveform
+from qiskit.pulse.transforms import block_to_schedule
+
+
+def schedule_fingerprint(schedule: Union[Schedule, ScheduleBlock]) -> str:
+    """
+    Canonical hash of what a schedule plays, ignoring instruction and schedule names, so
+    that schedules which simulate identically share a fingerprint.
+    """
+    if isinstance(schedule, ScheduleBlock):
+        schedule = block_to_schedule(schedule)
+
+    # sort by time then channel, keeping the order of instructions within a channel
+    instructions = sorted(schedule.instructions, key=lambda t0_instruction: (
+        t0_instruction[0], repr(t0_instruction[1].channel)
+    ))
+
+    h = hashlib.sha256()
+    for t0, instruction in instructions:
+        h.update(repr((t0, type(instruction).__name__)).encode())
+        if isinstance(instruction, Play):
+            h.update(repr(instruction.channel).encode())
+            h.update(_pulse_fingerprint(instruction.pulse))
+        else:
+            h.update(repr(tuple(_canonical(operand) for operand in instruction.operands)).encode())
+
+    return h.hexdigest()
+
+
+def deduplicate_schedules(schedules: List[Union[Schedule, ScheduleBlock]]) \
+        -> Tuple[Dict[str, Union[Schedule, ScheduleBlock]], List[str]]:
+    """
+    Return the unique schedules keyed by fingerprint, in order of first appearance, and the
+    fingerprint of each of the given schedules.
+    """
+    unique_schedules = {}
+    fingerprints = []
+    for schedule in schedules:
+        fingerprint = schedule_fingerprint(schedule)
+        unique_schedules.setdefault(fingerprint, schedule)
+        fingerprints.append(fingerprint)
+
+    return unique_schedules, fingerprints
+
+
+def _pulse_fingerprint(pulse) -> bytes:
+    if isinstance(pulse, Waveform):
+        return b"waveform" + np.ascontiguousarray(pulse.samples, dtype=complex).tobytes()
+
+    parameters = sorted((name, _canonical(value)) for name, value in pulse.parameters.items())
+    return repr((pulse.pulse_type, parameters)).encode()
+
+
+def _canonical(value):
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return repr(complex(value)) if isinstance(value, complex) else repr(float(value))
+
+    return repr(value)
@@ -1,4 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from qiskit.pulse import Instruction, Schedule
+from qiskit_dynamics import DynamicsBackend
 
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_single import \
     TimelineSingle
@@ -6,4 +10,18 @@ from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_single imp
 
 @dataclass
 class Context:
+    """
+    Lowering state of one timeline: the pulse instructions emitted so far with their start
+    times, and the time at which the next instruction starts.
+    """
     timeline: TimelineSingle
+    backend: DynamicsBackend = None
+    time: int = 0
+    instructions: List[Tuple[int, Instruction]] = field(default_factory=list)
+    has_measurement: bool = False
+    # measurement schedule of each qubit, shared between the timelines of a compilation
+    measure_schedules: Dict[int, Schedule] = field(default_factory=dict)
+
+    def append(self, instruction: Instruction):
+        self.instructions.append((self.time, instruction))
+        self.time += instruction.duration
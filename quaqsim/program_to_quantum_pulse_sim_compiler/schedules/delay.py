@@ -3,6 +3,6 @@ from dataclasses import dataclass
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.instruction import TimedInstruction
 
 
-@dataclass
+@dataclass(slots=True)
 class Delay(TimedInstruction):
     pass
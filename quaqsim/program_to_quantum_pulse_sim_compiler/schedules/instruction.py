@@ -1,17 +1,17 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Instruction:
     def accept(self, visitor: 'Visitor', instruction_context: 'Context'):
         visitor.visit(self, instruction_context)
 
 
-@dataclass
+@dataclass(slots=True)
 class TimedInstruction(Instruction):
     duration: int
 
 
-@dataclass
+@dataclass(slots=True)
 class InstructionContext(Instruction):
     pass
@@ -5,7 +5,7 @@ from qiskit.pulse.library import Pulse
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.instruction import TimedInstruction
 
 
-@dataclass
+@dataclass(slots=True)
 class Play(TimedInstruction):
     shape: Pulse
     phase: float = 0.
@@ -3,6 +3,6 @@ from dataclasses import dataclass
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.instruction import Instruction
 
 
-@dataclass
+@dataclass(slots=True)
 class ResetPhase(Instruction):
     pass
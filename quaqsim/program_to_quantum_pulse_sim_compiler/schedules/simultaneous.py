@@ -29,4 +29,4 @@ class Simultaneous(TimelineSingle):
                 self.current_time = instruction.duration
                 self.parent_timeline.current_time += instruction.duration
 
-        self.instructions.append(instruction)
+        self._append(instruction)
@@ -1,4 +1,5 @@
-from typing import Dict, List
+from collections import defaultdict
+from typing import Dict, List, Set
 
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline import Timeline
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_IQ import TimelineIQ
@@ -10,17 +11,38 @@ TimelineSchedule = List[Timeline]
 
 
 class TimelineSchedules:
-    map: Dict[Element, TimelineSchedule] = {}
+    def __init__(self):
+        self.map: Dict[Element, TimelineSchedule] = {}
+        # the elements driving each qubit, and the timeline each element is currently adding to
+        self._elements_by_qubit: Dict[int, List[Element]] = defaultdict(list)
+        self._current_timelines: Dict[Element, Timeline] = {}
+
+    def add_element(self, element: Element, timeline: Timeline):
+        if element in self.map:
+            self.map[element] = [timeline]
+            self._index()
+        else:
+            self.map[element] = [timeline]
+            self._elements_by_qubit[timeline.qubit_index].append(element)
+            self._current_timelines[element] = timeline
 
     def get_elements(self) -> List[Element]:
         return list(self.map.keys())
 
     def get_timeline(self, element: Element) -> Timeline:
-        return self.map[element][-1]
+        return self._current_timelines[element]
 
     def get_qubit_index(self, element: Element) -> int:
         return self.get_timeline(element).qubit_index
 
+    def get_active_qubits(self) -> Set[int]:
+        """ The qubits of the elements which play, wait or measure in any of the schedules. """
+        return {
+            schedule[0].qubit_index
+            for schedule in self.map.values()
+            if not all([timeline.is_passive() for timeline in schedule])
+        }
+
     def get_slice(self, index: int) -> Dict[Element, Timeline]:
         return {
             element: self.map[element][index]
@@ -29,40 +51,39 @@ class TimelineSchedules:
 
     def align(self, elements: List[Element]):
         if len(elements) == 0:
-            elements = list(self.map.keys())  # global align
+            elements = self.map.keys()  # global align
 
-        latest_time = 0
-        timelines = self.get_slice(-1).items()
-        for element, timeline in timelines:
-            if element in elements:
-                latest_time = max(latest_time, timeline.current_time)
+        timelines = [
+            self._current_timelines[element] for element in elements
+            if element in self._current_timelines
+        ]
+        latest_time = max((timeline.current_time for timeline in timelines), default=0)
 
-        for element, timeline in timelines:
-            if element in elements:
-                time_delta = latest_time - timeline.current_time
-                if time_delta != 0:
-                    timeline.delay(time_delta)
+        for timeline in timelines:
+            time_delta = latest_time - timeline.current_time
+            if time_delta != 0:
+                timeline.delay(time_delta)
 
     def restart_schedules_on_same_qubit_as(self, element: str):
         qubit_index = self.get_qubit_index(element)
-        for schedule in self.map.values():
+        for element in self._elements_by_qubit[qubit_index]:
+            schedule = self.map[element]
             first_timeline = schedule[0]
-            if first_timeline.qubit_index == qubit_index:
-                if isinstance(first_timeline, TimelineSingle):
-                    schedule.append(
-                        TimelineSingle(
-                            qubit_index=first_timeline.qubit_index,
-                            pulse_channel=first_timeline.pulse_channel
-                        )
-                    )
-                elif isinstance(first_timeline, TimelineIQ):
-                    schedule.append(
-                        TimelineIQ(
-                            qubit_index=first_timeline.qubit_index,
-                            pulse_channel_i=first_timeline.I.pulse_channel,
-                            pulse_channel_q=first_timeline.Q.pulse_channel
-                        )
-                    )
+            if isinstance(first_timeline, TimelineSingle):
+                timeline = TimelineSingle(
+                    qubit_index=first_timeline.qubit_index,
+                    pulse_channel=first_timeline.pulse_channel
+                )
+            elif isinstance(first_timeline, TimelineIQ):
+                timeline = TimelineIQ(
+                    qubit_index=first_timeline.qubit_index,
+                    pulse_channel_i=first_timeline.I.pulse_channel,
+                    pulse_channel_q=first_timeline.Q.pulse_channel
+                )
+            else:
+                continue
+            schedule.append(timeline)
+            self._current_timelines[element] = timeline
 
     def prune_elements_if_passive(self):
         self.map = {
@@ -70,6 +91,14 @@ class TimelineSchedules:
             for element, schedule in self.map.items()
             if not all([timeline.is_passive() for timeline in schedule])
         }
+        self._index()
+
+    def _index(self):
+        self._elements_by_qubit = defaultdict(list)
+        self._current_timelines = {}
+        for element, schedule in self.map.items():
+            self._elements_by_qubit[schedule[0].qubit_index].append(element)
+            self._current_timelines[element] = schedule[-1]
 
     def _validate_schedule_synchronization(self):
         schedule_lengths = [len(schedule) for schedule in self.map.values()]
@@ -3,6 +3,7 @@ from typing import Union, List
 from qiskit.pulse.channels import PulseChannel
 from qiskit.pulse.library import Pulse
 
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.delay import Delay
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.instruction import Instruction, \
     InstructionContext, TimedInstruction
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_base import TimelineBase
@@ -18,6 +19,8 @@ class TimelineSingleBase(TimelineBase):
         super().__init__(qubit_index=qubit_index)
         self.instructions: List[TimelineInstruction] = []
         self.pulse_channel: PulseChannel = pulse_channel
+        # number of instructions other than delays, kept up to date by `_append`
+        self._num_active_instructions: int = 0
 
     @property
     def current_time(self):
@@ -39,12 +42,19 @@ class TimelineSingleBase(TimelineBase):
         return len(self.instructions) == 0
 
     def is_passive(self):
-        from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.delay import Delay
-        non_delay_instructions = [
-            instr for instr in self.instructions if not isinstance(instr, Delay)
-        ]
-
-        return len(non_delay_instructions) == 0
+        return self._num_active_instructions == 0
+
+    def replace_instructions(self, instructions: List[TimelineInstruction]):
+        """ Replace the instructions, e.g. by an optimized sequence of the same duration. """
+        self.instructions = []
+        self._num_active_instructions = 0
+        for instruction in instructions:
+            self._append(instruction)
+
+    def _append(self, instruction: TimelineInstruction):
+        if not isinstance(instruction, Delay):
+            self._num_active_instructions += 1
+        self.instructions.append(instruction)
 
     # def simultaneous(self) -> 'Simultaneous':
     #     from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.simultaneous import \
@@ -60,7 +70,7 @@ class TimelineSingle(TimelineSingleBase, TimelineBuilder):
         """ Sequential behaviour by default. """
         if isinstance(instruction, TimedInstruction):
             self.current_time += instruction.duration
-        self.instructions.append(instruction)
+        self._append(instruction)
 
     def play(self, duration: int, shape: Pulse, phase: float = 0., limit_amplitude: bool = False, name: str = None):
         from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.play import Play
@@ -72,7 +82,6 @@ class TimelineSingle(TimelineSingleBase, TimelineBuilder):
         self.add_instruction(ResetPhase())
 
     def delay(self, duration: int):
-        from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.delay import Delay
         self.add_instruction(Delay(duration))
 
     def phase_offset(self, phase: float):
@@ -7,4 +7,4 @@ from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.visitors.visitor im
 
 class DelayVisitor(Visitor):
     def visit(self, instruction: Delay, instruction_context: Context):
-        pulse.delay(instruction.duration, instruction_context.timeline.pulse_channel)
+        instruction_context.append(pulse.Delay(instruction.duration, instruction_context.timeline.pulse_channel))
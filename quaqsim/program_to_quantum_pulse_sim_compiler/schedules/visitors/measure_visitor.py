@@ -1,13 +1,24 @@
-from qiskit import pulse
-from qiskit.pulse.channels import PulseChannel
+from qiskit.pulse import macros
 
-from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.measure import (Measure)
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.context import Context
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.measure import Measure
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.visitors.visitor import Visitor
 
 
 class MeasureVisitor(Visitor):
-    def visit(self, instruction: Measure, instruction_context: PulseChannel):
-        pulse.measure(
-            qubits=instruction.qubit_index,
-            registers=pulse.MemorySlot(instruction.qubit_index)
-        )
+    def visit(self, instruction: Measure, instruction_context: Context):
+        qubit_index = instruction.qubit_index
+        measure_schedule = instruction_context.measure_schedules.get(qubit_index)
+        if measure_schedule is None:
+            measure_schedule = macros.measure(
+                qubits=[qubit_index],
+                backend=instruction_context.backend,
+                qubit_mem_slots={qubit_index: qubit_index}
+            )
+            instruction_context.measure_schedules[qubit_index] = measure_schedule
+
+        start = instruction_context.time
+        for t0, measure_instruction in measure_schedule.instructions:
+            instruction_context.instructions.append((start + t0, measure_instruction))
+        instruction_context.time = start + measure_schedule.duration
+        instruction_context.has_measurement = True
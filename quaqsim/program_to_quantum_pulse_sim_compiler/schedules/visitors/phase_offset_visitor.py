@@ -7,4 +7,4 @@ from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.visitors.visitor im
 
 class PhaseOffsetVisitor(Visitor):
     def visit(self, instruction: PhaseOffset, instruction_context: Context):
-        pulse.shift_phase(instruction.phase, instruction_context.timeline.pulse_channel)
+        instruction_context.append(pulse.ShiftPhase(instruction.phase, instruction_context.timeline.pulse_channel))
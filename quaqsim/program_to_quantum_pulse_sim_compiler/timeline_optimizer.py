@@ -0,0 +1,143 @@
+import dataclasses
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+from .schedules.delay import Delay
+from .schedules.measure import Measure
+from .schedules.phase_offset import PhaseOffset
+from .schedules.play import Play
+from .schedules.reset_phase import ResetPhase
+from .schedules.timeline_IQ import TimelineIQ
+from .schedules.timeline_schedules import TimelineSchedules
+from .schedules.timeline_single import TimelineInstruction, TimelineSingle
+
+# phases closer than this (in radians) are considered equal
+_PHASE_TOLERANCE = 1e-12
+
+
+class _Frame(NamedTuple):
+    """ Frame phase of a channel, relative to its phase at the start of the timeline unless `absolute`. """
+    absolute: bool
+    phase: float
+
+    def equals(self, other: '_Frame') -> bool:
+        return self.absolute == other.absolute and abs(self.phase - other.phase) <= _PHASE_TOLERANCE
+
+
+class TimelinePeepholeOptimizer:
+    """
+    Rewrites every timeline into a shorter sequence with the same timing and the same frame
+    phase during every pulse:
+
+    - adjacent delays are merged, and zero delays dropped,
+    - phase offsets and resets are folded into a single change, made just before the next
+      pulse that sees it,
+    - a phase change is absorbed into the phase of the next `Play` when the frame is back to
+      its previous phase by the pulse after, or when no later pulse sees it and the `Play` is
+      already phase shifted (a phase shifted `Play` is lowered to three pulse instructions),
+    - phase changes after the last pulse are dropped, unless another timeline plays on the
+      same channel afterwards.
+    """
+    def optimize(self, schedules: TimelineSchedules) -> int:
+        """ Optimize the timelines in place, returning the number of instructions removed. """
+        # elements are only checked for having a timeline in every schedule when lowering,
+        # once the passive ones are pruned
+        num_schedules = max((len(schedule) for schedule in schedules.map.values()), default=0)
+
+        num_removed = 0
+        for i in range(num_schedules):
+            timelines = []
+            for schedule in schedules.map.values():
+                if i >= len(schedule):
+                    continue
+                timeline = schedule[i]
+                if isinstance(timeline, TimelineSingle):
+                    timelines.append(timeline)
+                elif isinstance(timeline, TimelineIQ):
+                    timelines.extend([timeline.I, timeline.Q])
+
+            channel_counts = Counter(timeline.pulse_channel for timeline in timelines)
+            for timeline in timelines:
+                num_instructions = len(timeline.instructions)
+                exclusive_channel = channel_counts[timeline.pulse_channel] == 1
+                timeline.replace_instructions(optimize_instructions(timeline.instructions, exclusive_channel))
+                num_removed += num_instructions - len(timeline.instructions)
+
+        return num_removed
+
+
+def optimize_instructions(instructions: List[TimelineInstruction],
+                          exclusive_channel: bool = True) -> List[TimelineInstruction]:
+    """
+    Optimize the instructions of one timeline. On an `exclusive_channel`, which no other
+    timeline plays on, the frame starts at zero and its phase after the last pulse is unused.
+    """
+    initial_frame = _Frame(absolute=exclusive_channel, phase=0.)
+
+    # delays are merged and phase changes only tracked, until an instruction which depends
+    # on them. `frames[i]` is the frame `events[i]` should see, or None if it doesn't see it.
+    events = []
+    frames = []
+    frame = initial_frame
+    pending_delay = 0
+    for instruction in instructions:
+        if isinstance(instruction, Delay):
+            pending_delay += instruction.duration
+        elif isinstance(instruction, PhaseOffset):
+            frame = _Frame(frame.absolute, frame.phase + instruction.phase)
+        elif isinstance(instruction, ResetPhase):
+            frame = _Frame(absolute=True, phase=0.)
+        else:
+            if pending_delay > 0:
+                events.append(Delay(pending_delay))
+                frames.append(None)
+                pending_delay = 0
+            events.append(instruction)
+            frames.append(None if isinstance(instruction, Measure) else frame)
+
+    if pending_delay > 0:
+        events.append(Delay(pending_delay))
+        frames.append(None)
+    final_frame = None if exclusive_channel else frame
+
+    # the frame seen by the next instruction which depends on it, after each event
+    next_frames: List[Optional[_Frame]] = [None] * len(events)
+    next_frame = final_frame
+    for i in reversed(range(len(events))):
+        next_frames[i] = next_frame
+        if frames[i] is not None:
+            next_frame = frames[i]
+
+    optimized = []
+    frame = initial_frame
+    for event, target_frame, next_frame in zip(events, frames, next_frames):
+        if target_frame is None:
+            optimized.append(event)
+            continue
+
+        if target_frame.absolute and not frame.absolute:
+            optimized.append(ResetPhase())
+            frame = _Frame(absolute=True, phase=0.)
+
+        phase = target_frame.phase - frame.phase
+        if abs(phase) <= _PHASE_TOLERANCE:
+            optimized.append(event)
+        elif isinstance(event, Play) and (
+                (next_frame is None and event.phase != 0.) or (next_frame is not None and next_frame.equals(frame))
+        ):
+            # the frame change is only seen by this pulse
+            optimized.append(dataclasses.replace(event, phase=event.phase + phase))
+        else:
+            optimized.append(PhaseOffset(phase))
+            optimized.append(event)
+            frame = target_frame
+
+    if final_frame is not None:
+        if final_frame.absolute and not frame.absolute:
+            optimized.append(ResetPhase())
+            frame = _Frame(absolute=True, phase=0.)
+        phase = final_frame.phase - frame.phase
+        if abs(phase) > _PHASE_TOLERANCE:
+            optimized.append(PhaseOffset(phase))
+
+    return optimized
@@ -1,11 +1,10 @@
-from typing import List, Dict
+from typing import Dict, List, Tuple
 
-from qiskit import pulse
-from qiskit.pulse import ScheduleBlock
+from qiskit.pulse import Instruction, Schedule
+from qiskit.pulse.channels import Channel
 from qiskit_dynamics import DynamicsBackend
 
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.context import Context
-from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.measure import Measure
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_IQ import TimelineIQ
 from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_schedules import \
     TimelineSchedules
@@ -16,35 +15,72 @@ from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.visitors.instructio
 
 
 class TimelineToPulseScheduleCompiler:
-    def compile(self, schedules: TimelineSchedules, backend: DynamicsBackend) -> List[ScheduleBlock]:
+    """
+    Lowers timelines straight to pulse `Schedule`s. The instructions of each timeline follow
+    each other, and the timelines are placed as early as the channels they share allow, as in
+    a left-aligned `pulse.build` block of `align_sequential` blocks, but every instruction's
+    start time is computed up front instead of through the builder contexts.
+    """
+    def compile(self, schedules: TimelineSchedules, backend: DynamicsBackend) -> List[Schedule]:
         schedules.prune_elements_if_passive()
 
         pulse_schedules = []
 
         instruction_visitor = InstructionVisitor()
+        measure_schedules = {}
         for i in range(schedules.num_schedules()):
             has_measurement = False
-            with pulse.build(backend) as schedule:
-                for element, timeline in schedules.get_slice(i).items():
-                    if timeline.is_passive():
-                        continue
-
-                    if isinstance(timeline, TimelineSingle):
-                        timelines = [timeline]
-                    elif isinstance(timeline, TimelineIQ):
-                        timelines = [timeline.I, timeline.Q]
-                    else:
-                        raise NotImplementedError()
-
-                    for timeline in timelines:
-                        with pulse.align_sequential():
-                            context = Context(timeline)
-                            for instruction in timeline.instructions:
-                                if isinstance(instruction, Measure):
-                                    has_measurement = True
-                                instruction.accept(instruction_visitor, context)
-
-            if len(schedule) > 0 and has_measurement:
-                pulse_schedules.append(schedule)
+            instructions = []
+            channel_stop_times = {}
+            for element, timeline in schedules.get_slice(i).items():
+                if timeline.is_passive():
+                    continue
+
+                if isinstance(timeline, TimelineSingle):
+                    timelines = [timeline]
+                elif isinstance(timeline, TimelineIQ):
+                    timelines = [timeline.I, timeline.Q]
+                else:
+                    raise NotImplementedError()
+
+                for timeline in timelines:
+                    context = Context(timeline, backend=backend, measure_schedules=measure_schedules)
+                    for instruction in timeline.instructions:
+                        instruction.accept(instruction_visitor, context)
+                    has_measurement |= context.has_measurement
+
+                    _align_left(instructions, channel_stop_times, context.instructions)
+
+            if len(instructions) > 0 and has_measurement:
+                pulse_schedules.append(Schedule(*instructions))
 
         return pulse_schedules
+
+
+def _align_left(instructions: List[Tuple[int, Instruction]],
+                channel_stop_times: Dict[Channel, int],
+                block: List[Tuple[int, Instruction]]):
+    """
+    Add a block of instructions at the earliest time after the instructions already on the
+    channels it uses, following `qiskit.pulse.transforms.AlignLeft`.
+    """
+    block_start_times = {}
+    block_stop_times = {}
+    for t0, instruction in block:
+        for channel in instruction.channels:
+            block_start_times[channel] = min(block_start_times.get(channel, t0), t0)
+            block_stop_times[channel] = max(block_stop_times.get(channel, 0), t0 + instruction.duration)
+
+    shared_insert_time = max((
+        channel_stop_times[channel] - start for channel, start in block_start_times.items()
+        if channel in channel_stop_times
+    ), default=0)
+    other_only_insert_time = min((
+        start for channel, start in block_start_times.items()
+        if channel not in channel_stop_times
+    ), default=0)
+    insert_time = max(shared_insert_time, other_only_insert_time)
+
+    instructions.extend((insert_time + t0, instruction) for t0, instruction in block)
+    for channel, stop in block_stop_times.items():
+        channel_stop_times[channel] = max(channel_stop_times.get(channel, 0), insert_time + stop)
@@ -1,10 +1,19 @@
 from quaqsim.program_ast.assign import Assign
-from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_visitor import \
-    ExpressionVisitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_compiler import \
+    compile_expression
 from quaqsim.program_to_quantum_pulse_sim_compiler.context import Context
-from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.visitor import Visitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.visitor import Visitor, Statement
 
 
 class AssignVisitor(Visitor):
     def visit(self, node: Assign, context: Context):
-        context.vars[node.target] = ExpressionVisitor().visit(node.value, context)
+        self.compile(node)(context)
+
+    def compile(self, node: Assign) -> Statement:
+        target = node.target
+        value = compile_expression(node.value)
+
+        def assign(context: Context):
+            context.vars[target] = value(context)
+
+        return assign
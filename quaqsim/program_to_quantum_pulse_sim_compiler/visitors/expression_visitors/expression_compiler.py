@@ -0,0 +1,89 @@
+import operator
+import threading
+import weakref
+from typing import Any, Callable
+
+from ...context import Context
+from ....program_ast.expressions import Expression, Reference, Operation, Literal, Function
+
+CompiledExpression = Callable[[Context], Any]
+
+_binary_operations = {
+    'ADD': operator.add,
+    'DIV': operator.truediv,
+    'MULT': operator.mul,
+    'SHR': operator.rshift,
+    'GT': operator.gt,
+    'GET': operator.ge,
+    'LT': operator.lt,
+    'LET': operator.le,
+    'EQ': operator.eq,
+}
+
+# compiled expressions live as long as the program's AST
+_compiled_expressions: "weakref.WeakKeyDictionary[Expression, CompiledExpression]" = weakref.WeakKeyDictionary()
+_compiled_expressions_lock = threading.Lock()
+
+
+def compile_expression(expression: Expression) -> CompiledExpression:
+    """
+    Turn an expression into a closure evaluating it against a context. Literals are parsed
+    once, and each expression node is only compiled the first time it is seen.
+    """
+    compiled = _compiled_expressions.get(expression)
+    if compiled is None:
+        compiled = _compile(expression)
+        with _compiled_expressions_lock:
+            compiled = _compiled_expressions.setdefault(expression, compiled)
+
+    return compiled
+
+
+def _compile(expression: Expression) -> CompiledExpression:
+    if isinstance(expression, Operation):
+        return _compile_operation(expression)
+
+    elif isinstance(expression, Reference):
+        name = expression.name
+        return lambda context: context.vars[name]
+
+    elif isinstance(expression, Literal):
+        value = eval(expression.value)
+        return lambda context: value
+
+    elif isinstance(expression, Function):
+        return _compile_function(expression)
+
+    else:
+        raise NotImplementedError(f"Uncrecognised expression type {type(expression)}")
+
+
+def _compile_operation(operation: Operation) -> CompiledExpression:
+    op = operation.operation
+    if op not in _binary_operations:
+        raise NotImplementedError(f'Unrecognised operation {op}')
+
+    binary_operation = _binary_operations[op]
+    left = compile_expression(operation.left)
+    right = compile_expression(operation.right)
+
+    if op == 'MULT':
+        def evaluate_mult(context: Context):
+            left_value = left(context)
+            # early exit without evaluating the right hand side
+            if left_value == 0:
+                return 0
+            return left_value * right(context)
+
+        return evaluate_mult
+
+    return lambda context: binary_operation(left(context), right(context))
+
+
+def _compile_function(function: Function) -> CompiledExpression:
+    if function.function_name == 'mul_fixed_by_int':
+        left = compile_expression(function.arguments[0])
+        right = compile_expression(function.arguments[1])
+        return lambda context: left(context) * right(context)
+    else:
+        raise NotImplementedError(f"Unimplemented function {function.function_name}.")
@@ -1,17 +1,26 @@
 import numpy as np
 
 from quaqsim.program_ast.frame_rotation_2pi import FrameRotation2Pi
-from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_visitor import \
-    ExpressionVisitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_compiler import \
+    compile_expression
 from quaqsim.program_to_quantum_pulse_sim_compiler.context import Context
-from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.visitor import Visitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.visitor import Visitor, Statement
 
 
 class FrameRotationVisitor(Visitor):
     def visit(self, node: FrameRotation2Pi, context: Context):
-        phase = ExpressionVisitor().visit(node.phase, context)
-        phase *= 2*np.pi
+        self.compile(node)(context)
 
-        for element in node.elements:
-            timeline = context.schedules.get_timeline(element)
-            timeline.phase_offset(phase)
+    def compile(self, node: FrameRotation2Pi) -> Statement:
+        phase_expression = compile_expression(node.phase)
+        elements = node.elements
+
+        def frame_rotation(context: Context):
+            phase = phase_expression(context)
+            phase *= 2*np.pi
+
+            for element in elements:
+                timeline = context.schedules.get_timeline(element)
+                timeline.phase_offset(phase)
+
+        return frame_rotation
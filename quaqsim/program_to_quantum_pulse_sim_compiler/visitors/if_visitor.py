@@ -1,13 +1,13 @@
 from quaqsim.program_ast._if import If
 from quaqsim.program_to_quantum_pulse_sim_compiler.context import Context
-from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_visitor import \
-    ExpressionVisitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_compiler import \
+    compile_expression
 from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.visitor import Visitor
 
 
 class IfVisitor(Visitor):
     def visit(self, node: If, context: Context):
-        condition = ExpressionVisitor().visit(node.cond, context)
+        condition = compile_expression(node.cond)(context)
 
         from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.node_visitor import \
             NodeVisitor
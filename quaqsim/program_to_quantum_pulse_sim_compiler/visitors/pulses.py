@@ -1,4 +1,6 @@
-from typing import Union, List, Tuple
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Union, List, Tuple
 
 import numpy as np
 from qiskit import pulse
@@ -6,59 +8,98 @@ from qiskit.pulse.library import Pulse
 
 from quaqsim.program_ast.measure import Measure
 from quaqsim.program_ast.play import Play
+from quaqsim.program_to_quantum_pulse_sim_compiler.compiled_config import CompiledConfig, WaveformRecord
 
 
 Length = int
 IQShapes = List[Pulse]
 
 
+class WaveformCache:
+    """
+    Bounded LRU cache of the pulses built by `waveform_shape`, keyed by the element, operation,
+    length and amplitude they are built from. The cached pulses are shared between the timelines,
+    so their samples are made read-only.
+    """
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._shapes: OrderedDict[Hashable, Tuple[Length, IQShapes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Tuple[Length, IQShapes]]) -> Tuple[Length, IQShapes]:
+        with self._lock:
+            if key in self._shapes:
+                self.hits += 1
+                self._shapes.move_to_end(key)
+                return self._shapes[key]
+
+            self.misses += 1
+
+        length, shapes = build()
+        for shape in shapes:
+            if isinstance(shape, pulse.Waveform):
+                shape.samples.flags.writeable = False
+
+        with self._lock:
+            self._shapes[key] = (length, shapes)
+            while len(self._shapes) > self.max_size:
+                self._shapes.popitem(last=False)
+
+        return length, shapes
+
+    def clear(self):
+        with self._lock:
+            self._shapes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._shapes)
+
+
 def waveform_shape(node: Union[Play, Measure],
-                   config: dict,
+                   config: Union[dict, CompiledConfig],
                    length: int = None,
-                   amplitude_scale_factor: float = None,) -> Tuple[Length, IQShapes]:
-    pulse_name = config['elements'][node.element]['operations'][node.operation]
-    pulse = config['pulses'][pulse_name]
-    if length is None:
-        length = pulse['length']
-
-    waveforms = pulse['waveforms']
+                   amplitude_scale_factor: float = None,
+                   cache: Optional[WaveformCache] = None) -> Tuple[Length, IQShapes]:
+    # the compiler passes its `CompiledConfig`, and a plain config is compiled on each call
+    if not isinstance(config, CompiledConfig):
+        config = CompiledConfig(config)
 
-    if set(waveforms.keys()) != {'I', 'Q'}:
-        raise NotImplementedError()
+    if cache is not None:
+        key = (node.element, node.operation, length, amplitude_scale_factor)
+        return cache.get(key, lambda: waveform_shape(node, config, length, amplitude_scale_factor))
 
-    I = config['waveforms'][waveforms['I']]
-    Q = config['waveforms'][waveforms['Q']]
+    record = config.operation(node.element, node.operation)
+    if length is None:
+        length = record.length
 
     I_Q_shapes = []
-    for waveform_config in [I, Q]:
-        if waveform_config['type'] == 'constant':
-            I_Q_shapes.append(_construct_constant_pulse(waveform_config, length, amplitude_scale_factor, name=pulse_name))
-        elif waveform_config['type'] == 'arbitrary':
-            I_Q_shapes.append(_construct_arbitrary_pulse(waveform_config, length, amplitude_scale_factor, name=pulse_name))
+    for waveform in [record.I, record.Q]:
+        if waveform.type == 'constant':
+            I_Q_shapes.append(_construct_constant_pulse(waveform, length, amplitude_scale_factor, name=record.pulse_name))
+        elif waveform.type == 'arbitrary':
+            samples = config.resampled_samples(waveform, length)
+            I_Q_shapes.append(_construct_arbitrary_pulse(samples, amplitude_scale_factor, name=record.pulse_name))
         else:
             raise NotImplementedError()
 
     return length, I_Q_shapes
 
 
-def _construct_constant_pulse(waveform_config: dict, length: int, amplitude_scale_factor=None, name: str = None) -> Pulse:
-    amplitude = waveform_config["sample"]
+def _construct_constant_pulse(waveform: WaveformRecord, length: int, amplitude_scale_factor=None, name: str = None) -> Pulse:
+    amplitude = float(waveform.samples[0])
     if amplitude_scale_factor is not None:
         amplitude *= amplitude_scale_factor
 
     return pulse.library.Constant(length, amplitude, name=name)
 
 
-def _construct_arbitrary_pulse(waveform_config: dict, length: int, amplitude_scale_factor=None, name: str = None) -> Pulse:
-    amplitudes = np.array(waveform_config["samples"])
+def _construct_arbitrary_pulse(samples: np.ndarray, amplitude_scale_factor=None, name: str = None) -> Pulse:
+    amplitudes = samples
     if amplitude_scale_factor is not None:
-        amplitudes *= amplitude_scale_factor
-
-    if length != len(amplitudes):
-        if length == len(amplitudes) * 4:
-            # todo: do this for any integer N, not just N=4
-            amplitudes = np.repeat(amplitudes, 4)
-        else:
-            raise NotImplementedError("Interpolation not yet implemented.")
+        amplitudes = amplitudes * amplitude_scale_factor
 
     return pulse.library.Waveform(amplitudes, limit_amplitude=False, name=name)
@@ -1,10 +1,18 @@
 import abc
+import functools
+from typing import Callable
 
 from ...program_ast.node import Node
 from ..context import Context
 
+Statement = Callable[[Context], None]
+
 
 class Visitor(abc.ABC):
     @abc.abstractmethod
     def visit(self, node: Node, context: Context):
         raise NotImplementedError()
+
+    def compile(self, node: Node) -> Statement:
+        """ A closure running `node` against a context, with its expressions compiled only once. """
+        return functools.partial(self.visit, node)
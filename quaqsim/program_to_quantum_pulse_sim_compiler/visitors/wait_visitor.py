@@ -1,27 +1,36 @@
 from quaqsim.program_ast.wait import Wait
-from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_visitor import \
-    ExpressionVisitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_compiler import \
+    compile_expression
 from quaqsim.program_to_quantum_pulse_sim_compiler.context import Context
-from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.visitor import Visitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.visitor import Visitor, Statement
 
 
 class WaitVisitor(Visitor):
     def visit(self, node: Wait, context: Context):
-        time = ExpressionVisitor().visit(node.time, context)
-        if isinstance(time, float):
-            time = cast_within_tolerance(time)
-
-        # convert into clock cycles from ns
-        time *= 4
-
-        if node.elements == []:
-            for element in context.schedules.get_elements():
-                timeline = context.schedules.get_timeline(element)
-                timeline.delay(time)
-        else:
-            for element in node.elements:
-                timeline = context.schedules.get_timeline(element)
-                timeline.delay(time)
+        self.compile(node)(context)
+
+    def compile(self, node: Wait) -> Statement:
+        time_expression = compile_expression(node.time)
+        elements = node.elements
+
+        def wait(context: Context):
+            time = time_expression(context)
+            if isinstance(time, float):
+                time = cast_within_tolerance(time)
+
+            # convert into clock cycles from ns
+            time *= 4
+
+            if elements == []:
+                for element in context.schedules.get_elements():
+                    timeline = context.schedules.get_timeline(element)
+                    timeline.delay(time)
+            else:
+                for element in elements:
+                    timeline = context.schedules.get_timeline(element)
+                    timeline.delay(time)
+
+        return wait
 
 
 def cast_within_tolerance(value: float, epsilon=1e-5):
@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from qiskit_dynamics import DynamicsBackend
 from qm import Program
 
 from quaqsim import Compiler
+from quaqsim.architectures.solver_policy import SolverPolicy
 from quaqsim.architectures.transmon_pair_backend_from_qua import ConfigToTransmonPairBackendMap
 from quaqsim.program_ast.program import Program as ProgramAST
 
@@ -12,15 +13,47 @@ def simulate_program(qua_program: Program | ProgramAST,
                      qua_config: dict,
                      qua_config_to_backend_map: ConfigToTransmonPairBackendMap,
                      backend: DynamicsBackend,
-                     num_shots: int,
-                     schedules_to_plot: List[int] = None):
+                     num_shots: Optional[int],
+                     schedules_to_plot: List[int] = None,
+                     batched: bool = False,
+                     workers: Optional[int] = None,
+                     exact_readout: bool = False,
+                     deduplicate: bool = True,
+                     stream: bool = False,
+                     chunk_size: int = 1,
+                     solver_policy: Optional[SolverPolicy] = None,
+                     subsystem_reduction_threshold: Optional[float] = 0.):
+    """
+    Compile and simulate a QUA program. With `stream=True`, returns an iterator of
+    `(schedule_index, populations)` that simulates `chunk_size` schedules at a time.
+    """
 
-    compiler = Compiler(config=qua_config)
+    compiler = Compiler(config=qua_config, subsystem_reduction_threshold=subsystem_reduction_threshold)
     sim = compiler.compile(qua_program, qua_config_to_backend_map, backend)
 
     if schedules_to_plot is not None:
         for i in schedules_to_plot:
             sim.plot_schedule(i)
-    results = sim.run(num_shots=num_shots)
+
+    if stream:
+        if workers is not None:
+            raise ValueError("Streaming simulation does not support process-pool workers.")
+        return sim.run_iter(
+            num_shots=num_shots,
+            batched=batched,
+            exact_readout=exact_readout,
+            deduplicate=deduplicate,
+            chunk_size=chunk_size,
+            solver_policy=solver_policy
+        )
+
+    results = sim.run(
+        num_shots=num_shots,
+        batched=batched,
+        workers=workers,
+        exact_readout=exact_readout,
+        deduplicate=deduplicate,
+        solver_policy=solver_policy
+    )
 
     return results
@@ -0,0 +1,46 @@
+import copy
+
+from quaqsim.architectures.backend_cache import BackendCache
+from quaqsim.architectures.transmon_pair import TransmonPair
+
+
+def test_backend_cache_reuses_backend_for_equal_system(transmon_pair, config_to_transmon_pair_backend_map):
+    cache = BackendCache()
+    backend = cache.get(transmon_pair, config_to_transmon_pair_backend_map)
+
+    channel_map = copy.deepcopy(config_to_transmon_pair_backend_map)
+    for channel in channel_map.values():
+        channel._channel_index = None
+    same_backend = cache.get(TransmonPair(copy.deepcopy(transmon_pair.settings)), channel_map)
+
+    assert same_backend is backend
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert channel_map["qubit_2"].get_q_channel_index() == 3
+    assert channel_map["resonator_1"].get_channel_index() is not None
+
+
+def test_backend_cache_misses_on_different_system(transmon_pair, config_to_transmon_pair_backend_map):
+    cache = BackendCache()
+    backend = cache.get(transmon_pair, config_to_transmon_pair_backend_map)
+
+    settings = copy.deepcopy(transmon_pair.settings)
+    settings.coupling_strength *= 2
+    assert cache.get(TransmonPair(settings), config_to_transmon_pair_backend_map) is not backend
+    assert cache.get(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-4) is not backend
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_backend_cache_evicts_least_recently_used(transmon_pair, config_to_transmon_pair_backend_map):
+    cache = BackendCache(max_size=2)
+    first = cache.get(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-6)
+    cache.get(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-5)
+    cache.get(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-6)
+    cache.get(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-4)
+
+    assert len(cache) == 2
+    assert cache.get(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-6) is first
+    assert (cache.hits, cache.misses) == (2, 3)
+
+    # atol=1e-5 was the least recently used, so it was evicted
+    cache.get(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-5)
+    assert cache.misses == 4
@@ -0,0 +1,57 @@
+import os
+
+import jax
+import pytest
+
+from quaqsim import Compiler
+from quaqsim.architectures.compilation_cache import deactivate_compilation_cache
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+
+
+@pytest.fixture
+def compilation_cache_dir(tmp_path):
+    yield str(tmp_path)
+    deactivate_compilation_cache()
+
+
+def test_persistent_compilation_cache(transmon_pair, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                      rabi_prog, compilation_cache_dir):
+    stats = []
+    for _ in range(2):
+        # a new backend has no in-memory jit cache, so kernels can only come from disk
+        backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map,
+                                             compilation_cache_dir=compilation_cache_dir)
+        sim = Compiler(config=transmon_pair_qua_config).compile(rabi_prog, config_to_transmon_pair_backend_map, backend)
+        sim.run(num_shots=None, batched=True)
+        stats.append(backend.compilation_cache_stats())
+
+    assert stats[0].misses > 0
+    assert stats[1].hits > stats[0].hits
+    assert stats[1].misses == stats[0].misses
+
+
+def test_compilation_cache_stats_requires_cache(transmon_pair_backend):
+    with pytest.raises(ValueError):
+        transmon_pair_backend.compilation_cache_stats()
+
+
+def test_backend_without_cache_does_not_use_active_cache(transmon_pair, transmon_pair_qua_config,
+                                                         config_to_transmon_pair_backend_map, rabi_prog,
+                                                         compilation_cache_dir):
+    min_compile_time = jax.config.jax_persistent_cache_min_compile_time_secs
+    cached_backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map,
+                                                compilation_cache_dir=compilation_cache_dir)
+    Compiler(config=transmon_pair_qua_config).compile(rabi_prog, config_to_transmon_pair_backend_map, cached_backend) \
+        .run(num_shots=None, batched=True)
+    cached_stats = cached_backend.compilation_cache_stats()
+    cached_files = sorted(os.listdir(compilation_cache_dir))
+
+    # different tolerances, so that the kernels are compiled anew
+    backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map, atol=1e-7)
+    Compiler(config=transmon_pair_qua_config).compile(rabi_prog, config_to_transmon_pair_backend_map, backend) \
+        .run(num_shots=None, batched=True)
+
+    assert cached_backend.compilation_cache_stats() == cached_stats
+    assert sorted(os.listdir(compilation_cache_dir)) == cached_files
+    assert jax.config.jax_compilation_cache_dir is None
+    assert jax.config.jax_persistent_cache_min_compile_time_secs == min_compile_time
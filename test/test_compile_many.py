@@ -0,0 +1,37 @@
+import numpy as np
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedule_fingerprint import schedule_fingerprint
+
+
+def rabi_program(amps, operation):
+    with program() as prog:
+        a = declare(fixed)
+        with for_(*from_array(a, amps)):
+            play(operation*amp(a), "qubit_1")
+            align("qubit_1", "resonator_1")
+            measure("readout", "resonator_1", None)
+
+    return prog
+
+
+def test_compile_many(transmon_pair_backend, transmon_pair_qua_config, config_to_transmon_pair_backend_map):
+    programs = [
+        rabi_program(np.linspace(0.1, 1, 2 + i), operation)
+        for i in range(4)
+        for operation in ["x90", "y90"]
+    ]
+
+    compiler = Compiler(config=transmon_pair_qua_config)
+    expected = [
+        compiler.compile(prog, config_to_transmon_pair_backend_map, transmon_pair_backend)
+        for prog in programs
+    ]
+    sims = compiler.compile_many(programs, config_to_transmon_pair_backend_map, transmon_pair_backend, max_workers=4)
+
+    assert len(sims) == len(programs)
+    for sim, expected_sim in zip(sims, expected):
+        assert [schedule_fingerprint(s) for s in sim.schedules] == \
+               [schedule_fingerprint(s) for s in expected_sim.schedules]
@@ -0,0 +1,43 @@
+import copy
+
+import numpy as np
+import pytest
+
+from quaqsim.program_ast.play import Play
+from quaqsim.program_to_quantum_pulse_sim_compiler.compiled_config import CompiledConfig
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.pulses import waveform_shape
+
+
+def test_compiled_config(transmon_pair_qua_config):
+    config = copy.deepcopy(transmon_pair_qua_config)
+    config["pulses"]["single_input_pulse"] = {
+        "operation": "control", "length": 16, "waveforms": {"single": "zero_wf"}
+    }
+    config["elements"]["qubit_1"]["operations"]["single"] = "single_input_pulse"
+
+    compiled_config = CompiledConfig(config)
+
+    record = compiled_config.operation("qubit_1", "x90")
+    assert record.pulse_name == "x90_q1_pulse"
+    assert record.length == config["pulses"]["x90_q1_pulse"]["length"]
+    assert record.I.type == "constant"
+    assert np.array_equal(record.I.samples, [config["waveforms"]["x90_q1_I_wf"]["sample"]])
+    assert not record.I.samples.flags.writeable
+
+    # unsupported or unknown operations only raise when they are looked up
+    with pytest.raises(NotImplementedError):
+        compiled_config.operation("qubit_1", "single")
+    with pytest.raises(KeyError):
+        compiled_config.operation("qubit_1", "unknown")
+
+
+def test_waveform_shape_with_plain_config(transmon_pair_qua_config):
+    config = copy.deepcopy(transmon_pair_qua_config)
+    node = Play(operation="x90", element="qubit_1")
+    length, shapes = waveform_shape(node, config, amplitude_scale_factor=0.5)
+    assert (length, shapes) == waveform_shape(node, CompiledConfig(config), amplitude_scale_factor=0.5)
+
+    # a plain config is compiled on each call, so changes to it are never stale
+    config["waveforms"]["x90_q1_I_wf"]["sample"] /= 2
+    _, halved_shapes = waveform_shape(node, config, amplitude_scale_factor=0.5)
+    assert halved_shapes[0].amp == shapes[0].amp / 2
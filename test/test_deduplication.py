@@ -0,0 +1,62 @@
+import numpy as np
+from qiskit import pulse
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.program_to_quantum_pulse_sim_compiler import quantum_pulse_sim
+from quaqsim.program_to_quantum_pulse_sim_compiler.readout import final_state_probabilities
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedule_fingerprint import deduplicate_schedules, \
+    schedule_fingerprint
+
+
+def test_schedule_fingerprint_ignores_names():
+    def build(amp: float, name: str):
+        with pulse.build(name=name) as schedule:
+            pulse.shift_phase(0.5, pulse.DriveChannel(0))
+            pulse.play(pulse.Constant(16, amp, name=name), pulse.DriveChannel(0))
+            pulse.acquire(1, 0, pulse.MemorySlot(0))
+        return schedule
+
+    assert schedule_fingerprint(build(0.1, "a")) == schedule_fingerprint(build(0.1, "b"))
+    assert schedule_fingerprint(build(0.1, "a")) != schedule_fingerprint(build(0.2, "a"))
+
+
+def test_averaged_rabi_is_deduplicated(transmon_pair_backend, transmon_pair_qua_config,
+                                       config_to_transmon_pair_backend_map, monkeypatch):
+    n_avg = 3
+    amps = np.array([0.5, 1., 1.5])
+    with program() as prog:
+        n = declare(int)
+        a = declare(fixed)
+        with for_(n, 0, n < n_avg, n + 1):
+            with for_(*from_array(a, amps)):
+                play("x90"*amp(a), "qubit_1")
+                align("qubit_1", "resonator_1")
+                measure("readout", "resonator_1", None)
+
+    sim = Compiler(config=transmon_pair_qua_config).compile(
+        prog, config_to_transmon_pair_backend_map, transmon_pair_backend
+    )
+    unique_schedules, fingerprints = deduplicate_schedules(sim.schedules)
+    assert len(sim.schedules) == n_avg * len(amps)
+    assert list(unique_schedules.keys()) == fingerprints[:len(amps)]
+    assert fingerprints == fingerprints[:len(amps)] * n_avg
+
+    # only the unique schedules are simulated
+    simulated_schedules = []
+
+    def recording_final_state_probabilities(backend, schedules, *args):
+        simulated_schedules.extend(schedules)
+        return final_state_probabilities(backend, schedules, *args)
+
+    monkeypatch.setattr(quantum_pulse_sim, "final_state_probabilities", recording_final_state_probabilities)
+    exact_results = np.array(sim.run(num_shots=None))
+    assert simulated_schedules == list(unique_schedules.values())
+    # a single measured qubit reports its ground state population
+    assert np.allclose(exact_results, np.tile(np.cos(np.pi*amps/4) ** 2, n_avg), atol=0.1)
+
+    sampled_results = np.array(sim.run(num_shots=1000))
+    assert sampled_results.shape == exact_results.shape
+    # each duplicate draws its own shots
+    assert len(set(sampled_results[0])) > len(amps)
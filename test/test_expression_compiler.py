@@ -0,0 +1,33 @@
+import pytest
+
+from quaqsim.program_ast.expressions import Function, Literal, Operation, Reference
+from quaqsim.program_to_quantum_pulse_sim_compiler.context import Context
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors.expression_compiler import \
+    compile_expression
+
+
+def test_compile_expression():
+    context = Context(qua_config={})
+    context.vars["a"] = 0.5
+    context.vars["n"] = 3
+
+    expression = Operation(
+        left=Function([Reference("a"), Reference("n")], function_name="mul_fixed_by_int", library_name="util"),
+        right=Literal("0.25"),
+        operation="ADD",
+    )
+    compiled = compile_expression(expression)
+
+    assert compiled(context) == pytest.approx(1.75)
+    context.vars["n"] = 1
+    assert compiled(context) == pytest.approx(0.75)
+    assert compile_expression(expression) is compiled
+
+    condition = compile_expression(Operation(Reference("n"), Literal("4"), "LT"))
+    assert condition(context)
+
+    # the right hand side of a multiplication by zero is never evaluated
+    assert compile_expression(Operation(Literal("0"), Reference("undeclared"), "MULT"))(context) == 0
+
+    with pytest.raises(NotImplementedError):
+        compile_expression(Operation(Literal("1"), Literal("1"), "XOR"))
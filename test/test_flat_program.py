@@ -0,0 +1,79 @@
+import numpy as np
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim.program_ast._if import If
+from quaqsim.program_ast.assign import Assign
+from quaqsim.program_ast.expressions import Literal, Operation, Reference
+from quaqsim.program_ast.program import Program as ProgramAST
+from quaqsim.program_dict_to_program_compiler.program_tree_builder import ProgramTreeBuilder
+from quaqsim.program_to_quantum_pulse_sim_compiler.context import Context
+from quaqsim.program_to_quantum_pulse_sim_compiler.flat_program import interpret, lower
+from quaqsim.program_to_quantum_pulse_sim_compiler.program_to_timelines_compiler import ProgramToTimelinesCompiler
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedule_fingerprint import schedule_fingerprint
+from quaqsim.program_to_quantum_pulse_sim_compiler.timeline_to_schedule_compiler import \
+    TimelineToPulseScheduleCompiler
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors import assign_visitor
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.expression_visitors import expression_compiler
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.program_visitor import ProgramVisitor
+
+
+def test_flat_program_matches_visitors(transmon_pair_backend, transmon_pair_qua_config,
+                                       config_to_transmon_pair_backend_map):
+    with program() as prog:
+        n = declare(int)
+        t = declare(int)
+        with for_(n, 0, n < 2, n + 1):
+            with for_(*from_array(t, np.arange(4, 20, 4))):
+                play("x90", "qubit_1")
+                with if_(t > 8):
+                    frame_rotation_2pi(0.25, "qubit_1")
+                wait(t, "qubit_1")
+                play("x90", "qubit_1")
+                align("qubit_1", "resonator_1")
+                measure("readout", "resonator_1", None)
+
+    program_tree = ProgramTreeBuilder().build(prog)
+
+    context = Context(qua_config=transmon_pair_qua_config)
+    context.create_timelines_for_each_element(config_to_transmon_pair_backend_map)
+    program_tree.accept(ProgramVisitor(), context)
+    expected = TimelineToPulseScheduleCompiler().compile(context.schedules, transmon_pair_backend)
+
+    timelines = ProgramToTimelinesCompiler().compile(
+        transmon_pair_qua_config, program_tree, config_to_transmon_pair_backend_map
+    )
+    schedules = TimelineToPulseScheduleCompiler().compile(timelines, transmon_pair_backend)
+
+    assert len(schedules) == len(expected) == 8
+    assert [schedule_fingerprint(s) for s in schedules] == [schedule_fingerprint(s) for s in expected]
+
+
+def test_flat_program_deep_nesting():
+    body = [Assign(target="x", value=Literal("1"))]
+    for _ in range(5000):
+        body = [If(body=body, cond=Literal("True"))]
+
+    context = Context(qua_config={})
+    interpret(lower(ProgramAST(body=body)), context)
+
+    assert context.vars["x"] == 1
+
+
+def test_flat_program_compiles_expressions_when_lowered(monkeypatch):
+    flat_program = lower(ProgramAST(body=[
+        Assign(target="x", value=Literal("1")),
+        If(body=[Assign(target="y", value=Operation(Reference("x"), Literal("2"), "ADD"))],
+           cond=Operation(Reference("x"), Literal("0"), "GT")),
+    ]))
+
+    def fail(expression):
+        raise AssertionError("Expressions must not be compiled while interpreting.")
+
+    monkeypatch.setattr(assign_visitor, "compile_expression", fail)
+    monkeypatch.setattr(expression_compiler, "compile_expression", fail)
+
+    context = Context(qua_config={})
+    interpret(flat_program, context)
+
+    assert context.vars == {"x": 1, "y": 3}
@@ -0,0 +1,105 @@
+import dataclasses
+
+import numpy as np
+import pytest
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.architectures import TransmonChainSettings
+from quaqsim.architectures.subsystem_reduction import ReducedSystem
+from quaqsim.architectures.transmon import Transmon
+from quaqsim.architectures.transmon_lattice import TransmonChain
+from quaqsim.architectures.transmon_pair import TransmonPair
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+
+
+def _open_transmon_pair(transmon_pair_settings, t1=None, t2=None) -> TransmonPair:
+    transmon_1_settings = dataclasses.replace(transmon_pair_settings.transmon_1_settings, t1=t1, t2=t2)
+    return TransmonPair(dataclasses.replace(transmon_pair_settings, transmon_1_settings=transmon_1_settings))
+
+
+def _decay_prog(taus: np.ndarray, second_pulse: bool):
+    with program() as prog:
+        tau = declare(int)
+        with for_(*from_array(tau, taus)):
+            play("x90", "qubit_1")
+            if not second_pulse:
+                play("x90", "qubit_1")
+            wait(tau, "qubit_1")
+            if second_pulse:
+                play("x90", "qubit_1")
+            align("qubit_1", "resonator_1")
+            measure("readout", "resonator_1", None)
+
+    return prog
+
+
+def _wait_times(sim) -> np.ndarray:
+    """ Time between the end of the pulses and the measurement of each schedule. """
+    dt = sim.backend.dt
+    return np.array([
+        (schedule.duration - sum(instruction.duration for _, instruction in schedule.instructions
+                                 if instruction.name == "x90" and instruction.channels[0].index == 0)) * dt
+        for schedule in sim.schedules
+    ])
+
+
+def test_transmon_dissipators(transmon_pair_settings):
+    settings = transmon_pair_settings.transmon_1_settings
+    assert Transmon(settings).dissipators() == []
+    assert len(Transmon(dataclasses.replace(settings, t1=1e-6, t2=2e-6)).dissipators()) == 1
+    assert len(Transmon(dataclasses.replace(settings, t1=1e-6, t2=1e-6)).dissipators()) == 2
+
+    with pytest.raises(ValueError):
+        Transmon(dataclasses.replace(settings, t1=1e-6, t2=3e-6))
+    with pytest.raises(ValueError):
+        Transmon(dataclasses.replace(settings, t1=0.))
+
+    transmon_pair = _open_transmon_pair(transmon_pair_settings, t1=1e-6, t2=1e-6)
+    chain = TransmonChain(TransmonChainSettings(
+        transmon_settings=[transmon_pair.settings.transmon_1_settings, transmon_pair.settings.transmon_2_settings],
+        coupling_strengths=[transmon_pair.coupling_strength]
+    ))
+    assert len(transmon_pair.static_dissipators()) == len(chain.static_dissipators()) == 2
+    for pair_dissipator, chain_dissipator in zip(transmon_pair.static_dissipators(), chain.static_dissipators()):
+        assert np.allclose(pair_dissipator, chain_dissipator.toarray())
+
+    # the dissipators of an idle qubit in its ground state vanish
+    assert len(ReducedSystem(transmon_pair, [0]).static_dissipators()) == 2
+    assert len(ReducedSystem(transmon_pair, [1]).static_dissipators()) == 0
+
+
+def test_t1_decay(transmon_pair_settings, transmon_pair_qua_config, config_to_transmon_pair_backend_map):
+    t1 = 0.4e-6
+    transmon_pair = _open_transmon_pair(transmon_pair_settings, t1=t1)
+    backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map)
+    assert backend.options.solver.model.dim == 9
+    assert backend.array_library == 'jax'
+
+    sim = Compiler(transmon_pair_qua_config).compile(
+        _decay_prog(np.array([4, 204, 404]), second_pulse=False), config_to_transmon_pair_backend_map, backend
+    )
+    excited_populations = 1 - np.array(sim.run(num_shots=None)[0])
+    wait_times = _wait_times(sim)
+
+    expected_populations = excited_populations[0] * np.exp(-(wait_times - wait_times[0]) / t1)
+    assert np.allclose(excited_populations, expected_populations, atol=0.01)
+
+
+def test_t2_dephasing(transmon_pair_settings, transmon_pair_qua_config, config_to_transmon_pair_backend_map):
+    t2 = 0.3e-6
+    transmon_pair = _open_transmon_pair(transmon_pair_settings, t2=t2)
+    backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map,
+                                         array_library='jax_sparse')
+
+    sim = Compiler(transmon_pair_qua_config).compile(
+        _decay_prog(np.array([4, 204, 404]), second_pulse=True), config_to_transmon_pair_backend_map, backend
+    )
+    ground_populations = np.array(sim.run(num_shots=None)[0])
+    wait_times = _wait_times(sim)
+
+    # the second x90 completes a pi rotation of the coherent part of the state only
+    coherence = 1 / 2 - ground_populations[0]
+    expected_populations = 1 / 2 - coherence * np.exp(-(wait_times - wait_times[0]) / t2)
+    assert np.allclose(ground_populations, expected_populations, atol=0.01)
@@ -1,8 +1,9 @@
 import numpy as np
 from matplotlib import pyplot as plt
+from qiskit.quantum_info import Statevector
 from qm.qua import *
 
-from quaqsim import simulate_program
+from quaqsim import Compiler, simulate_program
 
 
 def test_simultaneous_rabi(transmon_pair_backend, transmon_pair_qua_config, config_to_transmon_pair_backend_map):
@@ -42,3 +43,88 @@ def test_simultaneous_rabi(transmon_pair_backend, transmon_pair_qua_config, conf
     # # plt.plot(np.arange(start, stop, step), expected_state_probabilities, '.-', label=f"Expected")
     # plt.legend()
     # plt.show()
+
+
+def test_simultaneous_rabi_batched(transmon_pair_backend, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                   rabi_prog):
+    results = simulate_program(
+        qua_program=rabi_prog,
+        qua_config=transmon_pair_qua_config,
+        qua_config_to_backend_map=config_to_transmon_pair_backend_map,
+        backend=transmon_pair_backend,
+        num_shots=10_000,
+        batched=True
+    )
+
+    start, stop, step = -2, 2, 0.1
+    amps = np.arange(start, stop, step)
+    expected_state_probabilities = np.sin(np.pi*amps/4) ** 2
+    assert np.allclose(np.array(results[0]), expected_state_probabilities, atol=0.1)
+    assert np.allclose(np.array(results[1]), expected_state_probabilities, atol=0.1)
+
+
+def test_simultaneous_rabi_process_pool(transmon_pair_backend, transmon_pair_qua_config,
+                                        config_to_transmon_pair_backend_map, rabi_prog):
+    results = simulate_program(
+        qua_program=rabi_prog,
+        qua_config=transmon_pair_qua_config,
+        qua_config_to_backend_map=config_to_transmon_pair_backend_map,
+        backend=transmon_pair_backend,
+        num_shots=10_000,
+        workers=2
+    )
+
+    start, stop, step = -2, 2, 0.1
+    amps = np.arange(start, stop, step)
+    expected_state_probabilities = np.sin(np.pi*amps/4) ** 2
+    assert len(results) == 2
+    assert np.allclose(np.array(results[0]), expected_state_probabilities, atol=0.1)
+    assert np.allclose(np.array(results[1]), expected_state_probabilities, atol=0.1)
+
+
+def test_process_pool_keeps_backend_options(transmon_pair_backend, transmon_pair_qua_config,
+                                            config_to_transmon_pair_backend_map, rabi_prog):
+    # options set after construction must reach the backends rebuilt in the workers
+    transmon_pair_backend.set_options(seed_simulator=1234, initial_state=Statevector.from_int(1, dims=(3, 3)))
+    sim = Compiler(transmon_pair_qua_config).compile(
+        rabi_prog, config_to_transmon_pair_backend_map, transmon_pair_backend
+    )
+
+    exact_results = np.array(sim.run(num_shots=None, workers=1))
+    assert np.allclose(np.array(sim.run(num_shots=None, workers=2)), exact_results)
+
+    sampled_results = np.array(sim.run(num_shots=10_000, workers=1, deduplicate=False))
+    assert np.allclose(np.array(sim.run(num_shots=10_000, workers=2, deduplicate=False)), sampled_results, atol=0.05)
+
+    # each chunk of identical schedules draws its own shots, rather than repeating the same seed
+    with program() as repeated_prog:
+        n = declare(int)
+        with for_(n, 0, n < 4, n + 1):
+            play("x90", "qubit_1")
+            align("qubit_1", "resonator_1")
+            measure("readout", "resonator_1", None)
+
+    repeated_results = np.array(Compiler(transmon_pair_qua_config).compile(
+        repeated_prog, config_to_transmon_pair_backend_map, transmon_pair_backend
+    ).run(num_shots=1_000, workers=2, deduplicate=False))
+    assert not np.array_equal(repeated_results[:, :2], repeated_results[:, 2:])
+
+
+def test_simultaneous_rabi_exact_readout(transmon_pair_backend, transmon_pair_qua_config,
+                                         config_to_transmon_pair_backend_map, rabi_prog):
+    kwargs = dict(
+        qua_program=rabi_prog,
+        qua_config=transmon_pair_qua_config,
+        qua_config_to_backend_map=config_to_transmon_pair_backend_map,
+        backend=transmon_pair_backend,
+    )
+    exact_results = np.array(simulate_program(num_shots=None, **kwargs))
+    sampled_results = np.array(simulate_program(num_shots=10_000, exact_readout=True, **kwargs))
+
+    start, stop, step = -2, 2, 0.1
+    amps = np.arange(start, stop, step)
+    expected_state_probabilities = np.sin(np.pi*amps/4) ** 2
+    assert exact_results.shape == (2, len(amps))
+    assert np.allclose(exact_results, expected_state_probabilities, atol=0.1)
+    # shot noise of 10_000 shots is at most 0.005
+    assert np.allclose(sampled_results, exact_results, atol=0.03)
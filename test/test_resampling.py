@@ -0,0 +1,46 @@
+import copy
+
+import numpy as np
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.program_to_quantum_pulse_sim_compiler.resampling import resample
+
+
+def test_resample():
+    samples = np.array([0., 1., 2., 3.])
+
+    assert resample(samples, 4) is samples
+    assert np.array_equal(resample(samples, 12), np.repeat(samples, 3))
+    assert np.allclose(resample(samples, 2), [0.5, 2.5])
+    assert np.allclose(resample(samples, 6, 'cubic'), resample(samples, 6, 'linear'))
+    assert len(resample(np.sin(np.linspace(0, np.pi, 16)), 23, 'cubic')) == 23
+
+
+def test_duration_sweep_of_arbitrary_waveform(transmon_pair_backend, transmon_pair_qua_config,
+                                              config_to_transmon_pair_backend_map):
+    config = copy.deepcopy(transmon_pair_qua_config)
+    config["waveforms"]["gauss_wf"] = {"type": "arbitrary", "samples": list(0.1 * np.hanning(16))}
+    config["pulses"]["gauss_pulse"] = {
+        "operation": "control", "length": 16, "waveforms": {"I": "gauss_wf", "Q": "zero_wf"}
+    }
+    config["elements"]["qubit_1"]["operations"]["gauss"] = "gauss_pulse"
+
+    durations = np.arange(4, 11)
+    with program() as prog:
+        n = declare(int)
+        t = declare(int)
+        with for_(n, 0, n < 2, n + 1):
+            with for_(*from_array(t, durations)):
+                play("gauss", "qubit_1", duration=t)
+                align("qubit_1", "resonator_1")
+                measure("readout", "resonator_1", None)
+
+    compiler = Compiler(config=config)
+    sim = compiler.compile(prog, config_to_transmon_pair_backend_map, transmon_pair_backend)
+
+    assert all(schedule.duration >= 4 * duration for schedule, duration in zip(sim.schedules, durations))
+    cache_info = compiler.compiled_config.resampling_cache_info()
+    # the original length needs no resampling, and the second sweep reuses the resampled samples
+    assert cache_info.misses == len(durations) - 1
@@ -0,0 +1,54 @@
+import dataclasses
+
+import numpy as np
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import simulate_program
+from quaqsim.architectures.from_qua_channels import ChannelType
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA, RWA_MAX_STEP
+
+
+def test_rwa_matches_full_model(transmon_pair, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                transmon_pair_backend):
+    rwa_backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map, rwa=True)
+    assert rwa_backend.options.solver_options["hmax"] == RWA_MAX_STEP * rwa_backend.dt
+
+    with program() as prog:
+        tau = declare(int)
+        a = declare(fixed)
+        with for_(*from_array(tau, np.arange(4, 205, 40))):
+            with for_(*from_array(a, np.array([0.5, 1.]))):
+                play("x90"*amp(a), "qubit_1")
+                wait(tau, "qubit_1")
+                play("x90", "qubit_1")
+                align("qubit_1", "resonator_1")
+                measure("readout", "resonator_1", None)
+
+    full_results = simulate_program(prog, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                    transmon_pair_backend, num_shots=None)
+    rwa_results = simulate_program(prog, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                   rwa_backend, num_shots=None)
+
+    assert np.allclose(rwa_results[0], full_results[0], atol=2e-3)
+
+
+def test_rwa_cutoff_ignores_baseband_channels(transmon_pair, config_to_transmon_pair_backend_map):
+    carrier_frequencies = [channel.carrier_frequency for channel in config_to_transmon_pair_backend_map.values()
+                           if hasattr(channel, "carrier_frequency")]
+    baseband_channel = dataclasses.replace(
+        config_to_transmon_pair_backend_map["qubit_1t2"], carrier_frequency=0., type=ChannelType.CONTROL
+    )
+
+    # a baseband channel does not rotate, and must not bring the cutoff down to 0
+    rwa_backend = TransmonPairBackendFromQUA(
+        transmon_pair, {**config_to_transmon_pair_backend_map, "flux_1": baseband_channel}, rwa=True
+    )
+    assert rwa_backend.rwa
+    assert rwa_backend._rwa_cutoff_freq == min(carrier_frequencies)
+
+    # without any carrier, the full model is kept, stepping one sample at a time
+    baseband_map = {"flux_1": baseband_channel, "resonator_1": config_to_transmon_pair_backend_map["resonator_1"]}
+    baseband_backend = TransmonPairBackendFromQUA(transmon_pair, baseband_map, rwa=True)
+    assert not baseband_backend.rwa
+    assert baseband_backend.options.solver_options["hmax"] == baseband_backend.dt
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.architectures.segment_propagation import Segment, find_segments
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+
+
+def test_find_segments():
+    samples = np.array([[0, 0, 0, 1, 1, 1, 1, 2, 3, 3]], dtype=complex)
+
+    assert find_segments(samples, 0, 10, min_length=3) == [
+        Segment(0, 3, True), Segment(3, 7, True), Segment(7, 10, False)
+    ]
+    assert find_segments(samples, 2, 8, min_length=2) == [
+        Segment(2, 3, False), Segment(3, 7, True), Segment(7, 8, False)
+    ]
+
+
+def test_analytic_segments_match_ode(transmon_pair, transmon_pair_qua_config, config_to_transmon_pair_backend_map):
+    amps = np.array([0.5, 1., 1.5])
+    with program() as prog:
+        a = declare(fixed)
+        with for_(*from_array(a, amps)):
+            play("x90"*amp(a), "qubit_1")
+            play("x90"*amp(a), "qubit_1")
+            play("x90"*amp(a), "qubit_2")
+            align("qubit_1", "qubit_2", "resonator_1", "resonator_2")
+            measure("readout", "resonator_1", None)
+            measure("readout", "resonator_2", None)
+
+    results = {}
+    for analytic_segments in [False, True]:
+        backend = TransmonPairBackendFromQUA(
+            transmon_pair, config_to_transmon_pair_backend_map, analytic_segments=analytic_segments
+        )
+        sim = Compiler(config=transmon_pair_qua_config).compile(prog, config_to_transmon_pair_backend_map, backend)
+        results[analytic_segments] = np.array(sim.run(num_shots=None))
+
+    assert np.allclose(results[True], results[False], atol=2e-3)
+    assert backend.options.solver.period_propagators.misses == len(amps)
+
+
+def test_idle_segments_match_ode(transmon_pair, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                 monkeypatch):
+    waits = np.array([4, 1004, 2004])
+    with program() as prog:
+        t = declare(int)
+        with for_(*from_array(t, waits)):
+            play("x90", "qubit_1")
+            wait(t, "qubit_1")
+            play("x90", "qubit_1")
+            align("qubit_1", "resonator_1")
+            measure("readout", "resonator_1", None)
+
+    results = {}
+    idle_durations = []
+    for analytic_idle in [False, True]:
+        backend = TransmonPairBackendFromQUA(
+            transmon_pair, config_to_transmon_pair_backend_map, analytic_idle=analytic_idle
+        )
+        solver = backend.options.solver
+        static_propagator = solver._static_propagator
+
+        def recording_static_propagator(duration):
+            idle_durations.append(duration)
+            return static_propagator(duration)
+
+        monkeypatch.setattr(solver, "_static_propagator", recording_static_propagator)
+        sim = Compiler(config=transmon_pair_qua_config).compile(prog, config_to_transmon_pair_backend_map, backend)
+        results[analytic_idle] = np.array(sim.run(num_shots=None))
+        if not analytic_idle:
+            assert idle_durations == []
+
+    assert np.allclose(results[True], results[False], atol=1e-3)
+    # the waits of the default run are propagated rather than integrated
+    assert len(idle_durations) >= len(waits)
+    assert max(idle_durations) >= 4 * waits[-1] * backend.dt
+
+
+def test_analytic_segments_take_precedence_over_batched(transmon_pair, transmon_pair_qua_config,
+                                                         config_to_transmon_pair_backend_map, rabi_prog):
+    backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map, analytic_segments=True)
+    sim = Compiler(config=transmon_pair_qua_config).compile(rabi_prog, config_to_transmon_pair_backend_map, backend)
+
+    with pytest.warns(UserWarning, match="analytic_segments"):
+        batched_results = np.array(sim.run(num_shots=None, batched=True))
+
+    assert np.allclose(batched_results, sim.run(num_shots=None))
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.architectures.solver_policy import SolverPolicy
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA, RWA_MAX_STEP
+
+
+def test_solver_policy_tolerances():
+    policy = SolverPolicy()
+
+    assert policy.tolerance(None) == policy.min_tolerance
+    assert policy.tolerance(10_000) == pytest.approx(1e-5)
+    assert policy.tolerance(10) == policy.max_tolerance
+    assert SolverPolicy(precision=1e-3).tolerance(10) == pytest.approx(1e-6)
+    assert policy.solver_options(100, dt=1e-9) == {"atol": 1e-4, "rtol": 1e-4}
+    assert SolverPolicy(max_step=2.).solver_options(100, dt=1e-9) == {"atol": 1e-4, "rtol": 1e-4, "hmax": 2e-9}
+
+
+def test_solver_policy_accuracy(transmon_pair_backend, transmon_pair_qua_config,
+                                config_to_transmon_pair_backend_map):
+    amps = np.array([0.5, 1., 1.5])
+    with program() as prog:
+        a = declare(fixed)
+        with for_(*from_array(a, amps)):
+            play("x90"*amp(a), "qubit_1")
+            play("x90"*amp(a), "qubit_2")
+            align("qubit_1", "qubit_2", "resonator_1", "resonator_2")
+            measure("readout", "resonator_1", None)
+            measure("readout", "resonator_2", None)
+
+    sim = Compiler(config=transmon_pair_qua_config).compile(
+        prog, config_to_transmon_pair_backend_map, transmon_pair_backend
+    )
+
+    num_shots = 1000
+    accuracy = sim.check_accuracy(SolverPolicy(), num_shots)
+    assert accuracy.passed
+    assert accuracy.precision == pytest.approx(1 / np.sqrt(num_shots))
+
+    results = np.array(sim.run(num_shots=None, solver_policy=SolverPolicy(precision=1 / np.sqrt(num_shots))))
+    assert np.allclose(results, sim.run(num_shots=None), atol=accuracy.precision)
+
+    with pytest.raises(ValueError):
+        sim.check_accuracy(SolverPolicy(), num_shots=None)
+
+
+def test_solver_policy_keeps_rwa_max_step(transmon_pair, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                          rabi_prog):
+    rwa_backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map, rwa=True)
+    sim = Compiler(config=transmon_pair_qua_config).compile(rabi_prog, config_to_transmon_pair_backend_map, rwa_backend)
+
+    # the policy only loosens the tolerances, and keeps the longer steps of the rotating wave approximation
+    solver_options = sim._solver_options(SolverPolicy(), num_shots=1000)
+    assert solver_options["hmax"] == RWA_MAX_STEP * rwa_backend.dt
+    assert solver_options["atol"] == SolverPolicy().tolerance(1000)
+
+    results = np.array(sim.run(num_shots=None, solver_policy=SolverPolicy(precision=1e-2)))
+    assert np.allclose(results, sim.run(num_shots=None), atol=1e-2)
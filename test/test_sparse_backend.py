@@ -0,0 +1,59 @@
+import dataclasses
+
+import numpy as np
+import pytest
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import simulate_program
+from quaqsim.architectures import TransmonChainSettings
+from quaqsim.architectures.from_qua_channels import TransmonPairBackendChannelIQ, ChannelType, \
+    TransmonPairBackendChannelReadout
+from quaqsim.architectures.transmon_lattice import TransmonChain
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+
+
+def test_sparse_pair_backend_matches_dense(transmon_pair, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                           transmon_pair_backend):
+    sparse_backend = TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map,
+                                                array_library='jax_sparse')
+    assert transmon_pair_backend.array_library == 'jax'
+    assert sparse_backend.array_library == 'jax_sparse'
+
+    with program() as prog:
+        a = declare(fixed)
+        with for_(*from_array(a, np.linspace(0.2, 1.8, 3))):
+            play("x90"*amp(a), "qubit_1")
+            align("qubit_1", "resonator_1")
+            measure("readout", "resonator_1", None)
+
+    dense_results = simulate_program(prog, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                     transmon_pair_backend, num_shots=None)
+    sparse_results = simulate_program(prog, transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                      sparse_backend, num_shots=None)
+
+    assert np.allclose(sparse_results[0], dense_results[0], atol=1e-3)
+
+    with pytest.raises(ValueError):
+        TransmonPairBackendFromQUA(transmon_pair, config_to_transmon_pair_backend_map, array_library='numpy')
+
+
+def test_array_library_selected_from_dimension(transmon_pair_settings):
+    transmon_settings = [
+        dataclasses.replace(transmon_pair_settings.transmon_1_settings, resonant_frequency=frequency, dim=4)
+        for frequency in [4.86e9, 4.97e9, 5.11e9]
+    ]
+    chain = TransmonChain(TransmonChainSettings(transmon_settings, [2e6, 2e6]))
+    config_to_backend_map = {
+        "qubit_1": TransmonPairBackendChannelIQ(
+            qubit_index=0,
+            carrier_frequency=transmon_settings[0].resonant_frequency,
+            operator_i=chain.drive_operator(0, 'I'),
+            operator_q=chain.drive_operator(0, 'Q'),
+            type=ChannelType.DRIVE
+        ),
+        "resonator_1": TransmonPairBackendChannelReadout(0),
+    }
+
+    assert TransmonPairBackendFromQUA(chain, config_to_backend_map).array_library == 'jax'
+    assert TransmonPairBackendFromQUA(chain, config_to_backend_map, sparse_dim_threshold=64).array_library == 'jax_sparse'
@@ -0,0 +1,56 @@
+import numpy as np
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.program_to_quantum_pulse_sim_compiler import quantum_pulse_sim
+
+
+def rabi_simulator(backend, qua_config, config_to_backend_map, amps, n_avg=1):
+    with program() as prog:
+        n = declare(int)
+        a = declare(fixed)
+        with for_(n, 0, n < n_avg, n + 1):
+            with for_(*from_array(a, amps)):
+                play("x90"*amp(a), "qubit_1")
+                align("qubit_1", "resonator_1")
+                measure("readout", "resonator_1", None)
+
+    return Compiler(config=qua_config).compile(prog, config_to_backend_map, backend)
+
+
+def test_run_iter_matches_run(transmon_pair_backend, transmon_pair_qua_config,
+                              config_to_transmon_pair_backend_map):
+    amps = np.array([0.5, 1., 1.5])
+    sim = rabi_simulator(transmon_pair_backend, transmon_pair_qua_config,
+                         config_to_transmon_pair_backend_map, amps, n_avg=2)
+
+    streamed = list(sim.run_iter(num_shots=None, chunk_size=2))
+    assert [i for i, _ in streamed] == list(range(len(sim.schedules)))
+
+    results = sim.run(num_shots=None)
+    assert np.allclose(np.array([populations for _, populations in streamed]).T, results)
+
+
+def test_run_iter_stops_when_closed(transmon_pair_backend, transmon_pair_qua_config,
+                                    config_to_transmon_pair_backend_map, monkeypatch):
+    simulated = []
+
+    def counting_final_state_probabilities(backend, schedules, *args):
+        simulated.extend(schedules)
+        return final_state_probabilities(backend, schedules, *args)
+
+    final_state_probabilities = quantum_pulse_sim.final_state_probabilities
+    monkeypatch.setattr(quantum_pulse_sim, "final_state_probabilities", counting_final_state_probabilities)
+
+    amps = np.array([0.5, 1., 1.5, 2.])
+    sim = rabi_simulator(transmon_pair_backend, transmon_pair_qua_config,
+                         config_to_transmon_pair_backend_map, amps)
+
+    results = sim.run_iter(num_shots=100)
+    index, populations = next(results)
+    results.close()
+
+    assert index == 0
+    assert len(populations) == 1
+    assert len(simulated) == 1
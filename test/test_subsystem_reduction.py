@@ -0,0 +1,127 @@
+import dataclasses
+
+import numpy as np
+from qiskit.quantum_info import Statevector
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.architectures import TransmonChainSettings
+from quaqsim.architectures.from_qua_channels import TransmonPairBackendChannelIQ, ChannelType, \
+    TransmonPairBackendChannelReadout
+from quaqsim.architectures.subsystem_reduction import ReducedSystem
+from quaqsim.architectures.transmon_lattice import TransmonChain
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+
+
+def _rabi_prog(element: str, resonator: str):
+    with program() as prog:
+        a = declare(fixed)
+        with for_(*from_array(a, np.linspace(0.2, 1.8, 5))):
+            play("x90"*amp(a), element)
+            align(element, resonator)
+            measure("readout", resonator, None)
+
+    return prog
+
+
+def test_reduced_system_operators(transmon_pair):
+    reduced_system = ReducedSystem(transmon_pair, [1])
+
+    assert reduced_system.subsystem_dims == [1, 3]
+    assert np.allclose(reduced_system.system_hamiltonian().toarray(), transmon_pair.transmon_2.system_hamiltonian())
+    assert np.allclose(reduced_system.reduce(transmon_pair.transmon_2_drive_operator('Q')).toarray(),
+                       transmon_pair.transmon_2.drive_operator('Q'))
+    assert reduced_system.acts_within(transmon_pair.transmon_2_drive_operator('I'))
+    assert not reduced_system.acts_within(transmon_pair.transmon_1_drive_operator('I'))
+    assert reduced_system.coupling_to_idle_qubits() == transmon_pair.coupling_strength
+
+
+def test_single_qubit_program_is_reduced_above_coupling(transmon_pair_qua_config, config_to_transmon_pair_backend_map,
+                                                        transmon_pair_backend):
+    prog = _rabi_prog("qubit_2", "resonator_2")
+
+    full_sim = Compiler(transmon_pair_qua_config).compile(prog, config_to_transmon_pair_backend_map, transmon_pair_backend)
+    reduced_sim = Compiler(transmon_pair_qua_config, subsystem_reduction_threshold=1e7) \
+        .compile(prog, config_to_transmon_pair_backend_map, transmon_pair_backend)
+
+    # the transmons are coupled, so they are only simulated apart above the threshold
+    assert full_sim.backend is transmon_pair_backend
+    assert reduced_sim.backend.options.solver.model.dim == 3
+    assert reduced_sim.backend.options.subsystem_dims == [1, 3]
+
+    full_results = np.array(full_sim.run(num_shots=None))
+    reduced_results = np.array(reduced_sim.run(num_shots=None))
+    assert reduced_results.shape == full_results.shape == (2, 5)
+    assert np.allclose(reduced_results, full_results, atol=1e-3)
+
+
+def test_uncoupled_qubits_are_reduced(transmon_pair_settings, transmon_pair_qua_config,
+                                      config_to_transmon_pair_backend_map):
+    chain = TransmonChain(TransmonChainSettings(
+        transmon_settings=[transmon_pair_settings.transmon_1_settings,
+                           dataclasses.replace(transmon_pair_settings.transmon_2_settings, dim=4)],
+        coupling_strengths=[0.]
+    ))
+    channel = config_to_transmon_pair_backend_map["qubit_1"]
+    chain_map = {
+        "qubit_1": TransmonPairBackendChannelIQ(
+            qubit_index=0,
+            carrier_frequency=channel.carrier_frequency,
+            operator_i=chain.drive_operator(0, 'I'),
+            operator_q=chain.drive_operator(0, 'Q'),
+            type=ChannelType.DRIVE
+        ),
+        "resonator_1": TransmonPairBackendChannelReadout(0),
+    }
+    backend = TransmonPairBackendFromQUA(chain, chain_map)
+    prog = _rabi_prog("qubit_1", "resonator_1")
+
+    reduced_sim = Compiler(transmon_pair_qua_config).compile(prog, chain_map, backend)
+    full_sim = Compiler(transmon_pair_qua_config, subsystem_reduction_threshold=None).compile(prog, chain_map, backend)
+
+    assert reduced_sim.backend.options.subsystem_dims == [3, 1]
+    assert backend.reduced_to([0], 0.) is reduced_sim.backend
+    assert full_sim.backend is backend
+    assert np.allclose(reduced_sim.run(num_shots=None), full_sim.run(num_shots=None), atol=1e-4)
+
+    # an element on the reduced qubit which drives the idle one cannot be simulated apart
+    crossed_map = {**chain_map, "qubit_1": dataclasses.replace(
+        chain_map["qubit_1"], operator_i=chain.drive_operator(1, 'I'), operator_q=chain.drive_operator(1, 'Q')
+    )}
+    crossed_backend = TransmonPairBackendFromQUA(chain, crossed_map)
+    assert crossed_backend.reduced_to([0], 0.) is crossed_backend
+
+
+def test_reduced_backend_keeps_options(transmon_pair_settings, transmon_pair_qua_config):
+    chain = TransmonChain(TransmonChainSettings(
+        transmon_settings=[transmon_pair_settings.transmon_1_settings, transmon_pair_settings.transmon_2_settings],
+        coupling_strengths=[0.]
+    ))
+    chain_map = {
+        "qubit_1": TransmonPairBackendChannelIQ(
+            qubit_index=0,
+            carrier_frequency=transmon_pair_settings.transmon_1_settings.resonant_frequency,
+            operator_i=chain.drive_operator(0, 'I'),
+            operator_q=chain.drive_operator(0, 'Q'),
+            type=ChannelType.DRIVE
+        ),
+        "resonator_1": TransmonPairBackendChannelReadout(0),
+    }
+    backend = TransmonPairBackendFromQUA(chain, chain_map)
+    solver_options = {**backend.options.solver_options, "atol": 1e-3, "rtol": 1e-3}
+    backend.set_options(seed_simulator=1234, solver_options=solver_options)
+
+    sim = Compiler(transmon_pair_qua_config).compile(_rabi_prog("qubit_1", "resonator_1"), chain_map, backend)
+    assert sim.backend.options.subsystem_dims == [3, 1]
+    assert sim.backend.options.seed_simulator == 1234
+    assert sim.backend.options.solver_options == solver_options
+    assert sim.run(num_shots=100, deduplicate=False) == sim.run(num_shots=100, deduplicate=False)
+
+    # options set later are not lost on a cached reduced backend
+    backend.set_options(seed_simulator=5678)
+    assert backend.reduced_to([0], 0.).options.seed_simulator == 5678
+
+    # an initial state exciting the idle qubit cannot be simulated apart
+    backend.set_options(initial_state=Statevector.from_int(3, dims=(3, 3)))
+    assert backend.reduced_to([0], 0.) is backend
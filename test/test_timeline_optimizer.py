@@ -0,0 +1,73 @@
+import numpy as np
+from qiskit import pulse
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.delay import Delay
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.measure import Measure
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.phase_offset import PhaseOffset
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.play import Play
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.reset_phase import ResetPhase
+from quaqsim.program_to_quantum_pulse_sim_compiler.timeline_optimizer import optimize_instructions
+
+
+def test_optimize_instructions():
+    shape = pulse.Constant(16, 0.1)
+    instructions = [
+        Delay(0), Delay(4), PhaseOffset(0.1), Delay(4), PhaseOffset(0.2),
+        Play(16, shape),
+        # the frame is back to 0.3 by the next pulse, so this is only seen by one pulse
+        PhaseOffset(0.5), Play(16, shape), PhaseOffset(-0.5),
+        Delay(8), Play(16, shape),
+        ResetPhase(), PhaseOffset(0.4), Delay(4), Measure(0), Play(16, shape),
+        PhaseOffset(1.), Delay(4),
+    ]
+
+    optimized = optimize_instructions(instructions)
+    assert optimized == [
+        Delay(8), PhaseOffset(0.1 + 0.2),
+        Play(16, shape),
+        Play(16, shape, phase=0.5),
+        Delay(8), Play(16, shape),
+        # the frame starts at zero on a channel no other timeline plays on, so the reset is
+        # relative to the current frame
+        Delay(4), Measure(0), PhaseOffset(0.4 - (0.1 + 0.2)), Play(16, shape),
+        Delay(4),
+    ]
+    assert sum(i.duration for i in optimized if isinstance(i, (Delay, Play))) == \
+           sum(i.duration for i in instructions if isinstance(i, (Delay, Play)))
+
+    # another timeline may play on the channel afterwards, and see the final frame
+    shared = optimize_instructions(
+        [ResetPhase(), Play(16, shape), PhaseOffset(0.5), Delay(4), PhaseOffset(0.5)],
+        exclusive_channel=False
+    )
+    assert shared == [ResetPhase(), Play(16, shape), Delay(4), PhaseOffset(1.)]
+
+
+def test_optimized_program_simulates_identically(transmon_pair_backend, transmon_pair_qua_config,
+                                                 config_to_transmon_pair_backend_map):
+    with program() as prog:
+        t = declare(int)
+        with for_(*from_array(t, np.array([4, 24, 44]))):
+            play("x90", "qubit_1")
+            wait(t, "qubit_1")
+            frame_rotation_2pi(0.05, "qubit_1")
+            frame_rotation_2pi(0.1, "qubit_1")
+            play("x90", "qubit_1")
+            reset_frame("qubit_1")
+            align("qubit_1", "resonator_1")
+            measure("readout", "resonator_1", None)
+
+    results = {}
+    for optimize_timelines in [False, True]:
+        compiler = Compiler(config=transmon_pair_qua_config, optimize_timelines=optimize_timelines)
+        sim = compiler.compile(prog, config_to_transmon_pair_backend_map, transmon_pair_backend)
+        results[optimize_timelines] = (sim, sim.run(num_shots=None))
+
+    sim, populations = results[True]
+    unoptimized_sim, unoptimized_populations = results[False]
+    assert sim.num_removed_instructions > 0 and unoptimized_sim.num_removed_instructions == 0
+    assert sum(len(s.instructions) for s in sim.schedules) < sum(len(s.instructions) for s in unoptimized_sim.schedules)
+    assert np.allclose(populations, unoptimized_populations, atol=1e-10)
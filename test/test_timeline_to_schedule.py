@@ -0,0 +1,58 @@
+from qiskit import pulse
+
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedule_fingerprint import schedule_fingerprint
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_schedules import TimelineSchedules
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_single import TimelineSingle
+from quaqsim.program_to_quantum_pulse_sim_compiler.timeline_to_schedule_compiler import \
+    TimelineToPulseScheduleCompiler
+
+
+def test_direct_schedule_matches_builder(transmon_pair_backend):
+    drive, other_drive, acquire = pulse.DriveChannel(0), pulse.DriveChannel(1), pulse.AcquireChannel(1)
+    shape = pulse.Constant(16, 0.1)
+
+    schedules = TimelineSchedules()
+    schedules.add_element("qubit_1", TimelineSingle(qubit_index=0, pulse_channel=drive))
+    schedules.add_element("qubit_1_copy", TimelineSingle(qubit_index=0, pulse_channel=drive))
+    schedules.add_element("qubit_2", TimelineSingle(qubit_index=1, pulse_channel=other_drive))
+    schedules.add_element("resonator_1", TimelineSingle(qubit_index=0, pulse_channel=acquire))
+
+    qubit = schedules.get_timeline("qubit_1")
+    qubit.play(16, shape, name="x")
+    qubit.delay(8)
+    qubit.phase_offset(0.3)
+    qubit.play(16, shape, phase=0.5, name="y")
+    qubit.reset_phase()
+    # shares its channel with qubit_1, so it has to start once qubit_1 is done
+    schedules.get_timeline("qubit_1_copy").play(16, shape, name="x")
+    schedules.get_timeline("qubit_2").delay(4)
+    schedules.get_timeline("qubit_2").play(16, shape, name="x")
+    schedules.align(["qubit_1", "resonator_1"])
+    schedules.get_timeline("resonator_1").measure()
+
+    pulse_schedules = TimelineToPulseScheduleCompiler().compile(schedules, transmon_pair_backend)
+
+    with pulse.build(transmon_pair_backend) as expected:
+        with pulse.align_sequential():
+            pulse.play(shape, drive, name="x")
+            pulse.delay(8, drive)
+            pulse.shift_phase(0.3, drive)
+            with pulse.phase_offset(0.5, drive):
+                pulse.play(shape, drive, name="y")
+            pulse.set_phase(0, drive)
+        with pulse.align_sequential():
+            pulse.play(shape, drive, name="x")
+        with pulse.align_sequential():
+            pulse.delay(4, other_drive)
+            pulse.play(shape, other_drive, name="x")
+        with pulse.align_sequential():
+            pulse.delay(40, acquire)
+            pulse.measure(qubits=0, registers=pulse.MemorySlot(0))
+
+    assert len(pulse_schedules) == 1
+    assert isinstance(pulse_schedules[0], pulse.Schedule)
+    assert pulse_schedules[0].duration == pulse.transforms.block_to_schedule(expected).duration
+    assert schedule_fingerprint(pulse_schedules[0]) == schedule_fingerprint(expected)
+    assert pulse_schedules[0].ch_start_time(drive) == 0
+    assert [t0 for t0, i in pulse_schedules[0].filter(channels=[drive], instruction_types=[pulse.Play]).instructions] \
+           == [0, 24, 40]
@@ -0,0 +1,44 @@
+from qiskit import pulse
+
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_IQ import TimelineIQ
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_schedules import TimelineSchedules
+from quaqsim.program_to_quantum_pulse_sim_compiler.schedules.timeline_single import TimelineSingle
+
+
+def test_timeline_counters():
+    timeline = TimelineSingle(qubit_index=0, pulse_channel=pulse.DriveChannel(0))
+    assert timeline.is_empty() and timeline.is_passive()
+
+    timeline.delay(16)
+    assert not timeline.is_empty() and timeline.is_passive()
+    assert timeline.current_time == 16
+
+    timeline.phase_offset(0.5)
+    assert not timeline.is_passive()
+    assert timeline.current_time == 16
+
+    timeline_iq = TimelineIQ(qubit_index=0, pulse_channel_i=pulse.DriveChannel(0), pulse_channel_q=pulse.DriveChannel(1))
+    timeline_iq.delay(8)
+    assert timeline_iq.is_passive()
+    timeline_iq.play_i(16, pulse.Constant(16, 0.1))
+    assert not timeline_iq.is_passive()
+    assert timeline_iq.current_time == 24
+
+
+def test_timeline_schedules_are_per_instance():
+    schedules = TimelineSchedules()
+    schedules.add_element("qubit_1", TimelineSingle(qubit_index=0, pulse_channel=pulse.DriveChannel(0)))
+    schedules.add_element("qubit_2", TimelineSingle(qubit_index=1, pulse_channel=pulse.DriveChannel(1)))
+    schedules.add_element("resonator_1", TimelineSingle(qubit_index=0, pulse_channel=pulse.MeasureChannel(0)))
+
+    assert TimelineSchedules().map == {}
+
+    schedules.get_timeline("qubit_1").delay(16)
+    schedules.align(["qubit_1", "resonator_1"])
+    assert schedules.get_timeline("resonator_1").current_time == 16
+    assert schedules.get_timeline("qubit_2").current_time == 0
+
+    first_timeline = schedules.get_timeline("qubit_1")
+    schedules.restart_schedules_on_same_qubit_as("resonator_1")
+    assert schedules.get_timeline("qubit_1") is not first_timeline
+    assert [len(schedules.map[element]) for element in ["qubit_1", "qubit_2", "resonator_1"]] == [2, 1, 2]
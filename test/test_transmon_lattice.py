@@ -0,0 +1,89 @@
+import dataclasses
+
+import numpy as np
+import pytest
+from qm.qua import *
+from qualang_tools.loops import from_array
+from scipy import sparse
+
+from quaqsim import simulate_program
+from quaqsim.architectures import TransmonChainSettings, TransmonCoupling, TransmonLatticeSettings
+from quaqsim.architectures.from_qua_channels import TransmonPairBackendChannelIQ, ChannelType, \
+    TransmonPairBackendChannelReadout
+from quaqsim.architectures.transmon_lattice import TransmonChain, TransmonLattice
+from quaqsim.architectures.transmon_pair_backend_from_qua import TransmonPairBackendFromQUA
+
+
+def test_two_transmon_chain_matches_pair(transmon_pair_settings, transmon_pair):
+    chain = TransmonChain(TransmonChainSettings(
+        transmon_settings=[transmon_pair_settings.transmon_1_settings, transmon_pair_settings.transmon_2_settings],
+        coupling_strengths=[transmon_pair_settings.coupling_strength]
+    ))
+
+    assert sparse.issparse(chain.system_hamiltonian())
+    assert np.allclose(chain.system_hamiltonian().toarray(), transmon_pair.system_hamiltonian())
+    assert np.allclose(chain.drive_operator(0, 'I').toarray(), transmon_pair.transmon_1_drive_operator('I'))
+    assert np.allclose(chain.drive_operator(1, 'Q').toarray(), transmon_pair.transmon_2_drive_operator('Q'))
+
+
+def test_lattice_operators(transmon_pair_settings):
+    transmon_settings = transmon_pair_settings.transmon_1_settings
+    dims = [3, 2, 4, 3]
+    lattice = TransmonLattice(TransmonLatticeSettings(
+        transmon_settings=[dataclasses.replace(transmon_settings, dim=d) for d in dims],
+        couplings=[TransmonCoupling(0, 1, 1e6), TransmonCoupling(1, 2, 2e6), TransmonCoupling(0, 3, 3e6)]
+    ))
+
+    hamiltonian = lattice.system_hamiltonian()
+    assert lattice.subsystem_dims == dims and hamiltonian.shape == (72, 72)
+    assert abs(hamiltonian - hamiltonian.conj().T).max() < 1e-6
+    # diagonal single transmon terms, and two off-diagonal entries per coupled level pair
+    assert hamiltonian.nnz < 72 * 8
+
+    # subsystem 0 is the rightmost Kronecker factor
+    expected_number_operator = np.kron(np.eye(3 * 4 * 2), np.diag(np.arange(3)))
+    assert np.allclose(lattice.number_operator(0).toarray(), expected_number_operator)
+    assert lattice.number_operator(0) is lattice.number_operator(0)
+
+    with pytest.raises(ValueError):
+        TransmonLattice(TransmonLatticeSettings([transmon_settings] * 2, [TransmonCoupling(0, 2, 1e6)]))
+    with pytest.raises(ValueError):
+        TransmonChainSettings([transmon_settings] * 3, [1e6]).to_lattice_settings()
+
+
+def test_uncoupled_transmon_does_not_change_rabi(transmon_pair_settings, transmon_pair_qua_config,
+                                                 config_to_transmon_pair_backend_map, transmon_pair_backend):
+    idle_transmon_settings = dataclasses.replace(transmon_pair_settings.transmon_1_settings, resonant_frequency=5.3e9)
+    chain = TransmonChain(TransmonChainSettings(
+        transmon_settings=[transmon_pair_settings.transmon_1_settings,
+                           transmon_pair_settings.transmon_2_settings,
+                           idle_transmon_settings],
+        coupling_strengths=[transmon_pair_settings.coupling_strength, 0.]
+    ))
+    pair_map = config_to_transmon_pair_backend_map
+    chain_map = {
+        "qubit_1": TransmonPairBackendChannelIQ(
+            qubit_index=0,
+            carrier_frequency=pair_map["qubit_1"].carrier_frequency,
+            operator_i=chain.drive_operator(0, 'I'),
+            operator_q=chain.drive_operator(0, 'Q'),
+            type=ChannelType.DRIVE
+        ),
+        "resonator_1": TransmonPairBackendChannelReadout(0),
+    }
+    chain_backend = TransmonPairBackendFromQUA(chain, chain_map)
+
+    with program() as prog:
+        a = declare(fixed)
+        with for_(*from_array(a, np.linspace(0.2, 1.8, 3))):
+            play("x90"*amp(a), "qubit_1")
+            align("qubit_1", "resonator_1")
+            measure("readout", "resonator_1", None)
+
+    pair_results = simulate_program(prog, transmon_pair_qua_config, pair_map, transmon_pair_backend, num_shots=None)
+    chain_results = simulate_program(prog, transmon_pair_qua_config, chain_map, chain_backend, num_shots=None)
+
+    assert np.allclose(chain_results[0], pair_results[0], atol=1e-3)
+
+    with pytest.raises(ValueError):
+        TransmonPairBackendFromQUA(chain, {**chain_map, "resonator_4": TransmonPairBackendChannelReadout(3)})
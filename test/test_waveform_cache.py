@@ -0,0 +1,39 @@
+import numpy as np
+from qm.qua import *
+from qualang_tools.loops import from_array
+
+from quaqsim import Compiler
+from quaqsim.program_to_quantum_pulse_sim_compiler.visitors.pulses import WaveformCache
+
+
+def test_waveform_cache(transmon_pair_backend, transmon_pair_qua_config, config_to_transmon_pair_backend_map):
+    amps = np.array([0.5, 1., 1.5])
+    with program() as prog:
+        n = declare(int)
+        a = declare(fixed)
+        with for_(n, 0, n < 4, n + 1):
+            with for_(*from_array(a, amps)):
+                play("x90"*amp(a), "qubit_1")
+                play("x90", "qubit_1")
+                align("qubit_1", "resonator_1")
+                measure("readout", "resonator_1", None)
+
+    compiler = Compiler(config=transmon_pair_qua_config)
+    sim = compiler.compile(prog, config_to_transmon_pair_backend_map, transmon_pair_backend)
+
+    assert len(sim.schedules) == 4 * len(amps)
+    assert compiler.waveform_cache.misses == len(amps) + 1
+    assert compiler.waveform_cache.hits == 2 * 4 * len(amps) - compiler.waveform_cache.misses
+
+    # the cache is shared between the programs compiled with the same compiler
+    compiler.compile(prog, config_to_transmon_pair_backend_map, transmon_pair_backend)
+    assert compiler.waveform_cache.misses == len(amps) + 1
+
+
+def test_waveform_cache_eviction():
+    cache = WaveformCache(max_size=2)
+    for key in ["a", "b", "a", "c", "b"]:
+        cache.get(key, lambda: (16, []))
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 4)